@@ -1,5 +1,5 @@
 import { type NextRequest, NextResponse } from "next/server"
-import { getUserTranslations } from "@/lib/data-access"
+import { decodeHistoryCursor, getUserTranslations, getUserTranslationsPage } from "@/lib/data-access"
 
 export async function GET(request: NextRequest) {
   try {
@@ -10,6 +10,29 @@ export async function GET(request: NextRequest) {
       return NextResponse.json({ error: "User ID is required" }, { status: 400 })
     }
 
+    // With ?limit= the history is returned a page at a time; follow nextCursor with ?cursor= for the next page
+    const limit = searchParams.get("limit")
+    if (limit !== null) {
+      const pageSize = /^\d+$/.test(limit) ? Number.parseInt(limit, 10) : Number.NaN
+      if (!Number.isInteger(pageSize) || pageSize < 1) {
+        return NextResponse.json({ error: "limit must be a positive integer" }, { status: 400 })
+      }
+
+      const cursorParam = searchParams.get("cursor")
+      const cursor = cursorParam ? decodeHistoryCursor(cursorParam) : null
+      if (cursorParam && !cursor) {
+        return NextResponse.json({ error: "Invalid cursor" }, { status: 400 })
+      }
+
+      const page = await getUserTranslationsPage(Number.parseInt(userId, 10), pageSize, cursor)
+
+      return NextResponse.json({
+        success: true,
+        data: page.items,
+        nextCursor: page.nextCursor,
+      })
+    }
+
     const translations = await getUserTranslations(Number.parseInt(userId, 10))
 
     return NextResponse.json({
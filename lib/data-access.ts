@@ -55,6 +55,70 @@ export async function getUserTranslations(userId: number): Promise<UserLaymenTer
   }
 }
 
+export interface UserTranslationsPage {
+  items: UserLaymenTermsView[]
+  nextCursor: string | null
+}
+
+export const MAX_HISTORY_PAGE_SIZE = 100
+
+// Cursors are opaque to clients: the (submittedAt, submissionId) of the last row of the previous page
+export function encodeHistoryCursor(row: UserLaymenTermsView): string {
+  return Buffer.from(JSON.stringify([row.submittedAt, row.submissionId])).toString("base64url")
+}
+
+// The timestamp is interpolated into a PostgREST filter, so only a plain ISO 8601 timestamp is accepted.
+// It is kept as sent rather than re-serialized, since toISOString() would drop Postgres' microseconds and skip rows
+const HISTORY_TIMESTAMP = /^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{1,6})?(Z|[+-]\d{2}:\d{2})?$/
+
+export function decodeHistoryCursor(cursor: string): [string, number] | null {
+  try {
+    const [submittedAt, submissionId] = JSON.parse(Buffer.from(cursor, "base64url").toString("utf8"))
+    if (typeof submittedAt !== "string" || !Number.isInteger(submissionId)) return null
+    if (!HISTORY_TIMESTAMP.test(submittedAt) || Number.isNaN(Date.parse(submittedAt))) return null
+    return [submittedAt, submissionId]
+  } catch {
+    return null
+  }
+}
+
+// Get one page of user translations history, newest first, using keyset pagination
+export async function getUserTranslationsPage(
+  userId: number,
+  limit: number,
+  cursor: [string, number] | null = null,
+): Promise<UserTranslationsPage> {
+  const pageSize = Math.min(Math.max(limit, 1), MAX_HISTORY_PAGE_SIZE)
+  try {
+    let query = supabase
+      .from('user_laymen_terms_view')
+      .select('*')
+      .eq('userId', userId)
+
+    if (cursor) {
+      const [submittedAt, submissionId] = cursor
+      query = query.or(`submittedAt.lt.${submittedAt},and(submittedAt.eq.${submittedAt},submissionId.lt.${submissionId})`)
+    }
+
+    // Fetch one extra row to learn whether another page follows without a count query
+    const { data, error } = await query
+      .order('submittedAt', { ascending: false })
+      .order('submissionId', { ascending: false })
+      .limit(pageSize + 1)
+
+    if (error) throw error
+    const rows = data || []
+    const items = rows.slice(0, pageSize)
+    return {
+      items,
+      nextCursor: rows.length > pageSize ? encodeHistoryCursor(items[items.length - 1]) : null,
+    }
+  } catch (error) {
+    console.error("Error fetching user translations page:", error)
+    return { items: [], nextCursor: null }
+  }
+}
+
 // Get user activity summary
 export async function getUserActivitySummary(userId: number): Promise<UserActivitySummary | null> {
   try {
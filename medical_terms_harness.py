@@ -0,0 +1,4338 @@
+"""
+Medical Terms Website Debugging Harness
+Creates test accounts and performs medical translations testing; run through medical_terms_debug.py
+"""
+
+import time
+import json
+import math
+import copy
+import queue
+import random
+import logging
+import argparse
+import threading
+import os
+import re
+import sys
+import heapq
+import itertools
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter, deque
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlparse, urlencode
+
+logger = logging.getLogger(__name__)
+
+class HTTPClientError(Exception):
+    """An http.client protocol error, re-raised so callers can catch it without importing http.client"""
+
+# Errors a failed HTTP exchange can raise; both connection failures and protocol errors
+HTTP_ERRORS = (OSError, HTTPClientError)
+
+def import_selenium():
+    """Import selenium into the module namespace; only browser runs pay its import time"""
+    global webdriver, By, WebDriverWait, Options, Keys
+    global TimeoutException, NoSuchElementException, StaleElementReferenceException, WebDriverException
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.keys import Keys
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException, WebDriverException
+
+def import_aiohttp():
+    """Import asyncio and aiohttp into the module namespace; only load runs pay their import time"""
+    global asyncio, aiohttp
+    import asyncio
+    import aiohttp
+
+# Shared by a run's shard processes, which inherit it through the environment
+RUN_ID_VARIABLE = "MEDICAL_TERMS_RUN_ID"
+
+class JSONLogFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, run, pid and message, plus a step event's fields when present"""
+    
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "run": os.environ.get(RUN_ID_VARIABLE),
+            "pid": record.process,
+            "msg": record.getMessage()
+        }
+        entry.update(getattr(record, "event", None) or {})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+def configure_logging(log_file='medical_terms_debug.log'):
+    """Log text to stderr and, unless log_file is None, JSON lines to a file that is only created once something is logged"""
+    os.environ.setdefault(RUN_ID_VARIABLE, f"{datetime.now():%Y%m%dT%H%M%S}-{os.getpid()}")
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    # Per-step events go to the file only; the console keeps its one line per milestone
+    console.addFilter(lambda record: not hasattr(record, "event"))
+    handlers = [console]
+    if log_file:
+        file_handler = logging.FileHandler(log_file, delay=True)
+        file_handler.setFormatter(JSONLogFormatter())
+        handlers.append(file_handler)
+    logging.basicConfig(level=logging.INFO, handlers=handlers)
+
+def current_log_file():
+    """Return the path of the log file configure_logging set up, or None when logging to stderr only"""
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.FileHandler):
+            return handler.baseFilename
+    return None
+
+DEFAULT_BASE_URL = "https://medicalterms.vercel.app"
+
+# Installed once per document: counts fetch/XHR requests and DOM mutations so waits can key off real page activity
+NETWORK_STATE_SCRIPT = """
+if (!window.__debuggerNetwork) {
+    var state = window.__debuggerNetwork = {pending: 0, started: 0, mutations: 0};
+    // Client-side toggles such as the Sign Up/Sign In switch only re-render, without navigating or fetching
+    new MutationObserver(function(records) { state.mutations += records.length; }).observe(
+        document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true}
+    );
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function() {
+            state.pending++;
+            state.started++;
+            return originalFetch.apply(this, arguments).finally(function() { state.pending--; });
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        state.pending++;
+        state.started++;
+        this.addEventListener('loadend', function() { state.pending--; });
+        return originalSend.apply(this, arguments);
+    };
+}
+return {
+    ready: document.readyState,
+    pending: window.__debuggerNetwork.pending,
+    started: window.__debuggerNetwork.started,
+    mutations: window.__debuggerNetwork.mutations,
+    resources: performance.getEntriesByType('resource').length
+};
+"""
+
+# Serializes forms, inputs, buttons and links in one round-trip instead of one get_attribute call per attribute.
+# arguments[0] is the DOM hash of the last capture; when it still matches only the hash is returned.
+PAGE_STRUCTURE_SCRIPT = """
+var html = document.documentElement.outerHTML;
+var hash = 5381;
+for (var i = 0; i < html.length; i++) {
+    hash = ((hash << 5) + hash + html.charCodeAt(i)) | 0;
+}
+hash = (hash >>> 0).toString(16) + ':' + html.length;
+if (arguments[0] && arguments[0] === hash) {
+    return {dom_hash: hash, unchanged: true};
+}
+function prop(el, name) {
+    var value = el[name];
+    if (value === undefined || value === null || typeof value === 'object') {
+        value = el.getAttribute(name);
+    }
+    return value;
+}
+function visibleText(el) {
+    if (!el.getClientRects().length) {
+        return '';
+    }
+    return (el.innerText || '').trim();
+}
+function collect(tag, fields) {
+    return Array.prototype.map.call(document.getElementsByTagName(tag), function(el) {
+        var info = {};
+        fields.forEach(function(field) {
+            if (field === 'text') {
+                info.text = visibleText(el);
+            } else if (field === 'class') {
+                info['class'] = el.getAttribute('class');
+            } else {
+                info[field] = prop(el, field);
+            }
+        });
+        return info;
+    });
+}
+return {
+    dom_hash: hash,
+    unchanged: false,
+    title: document.title,
+    url: location.href,
+    forms_count: document.getElementsByTagName('form').length,
+    inputs: collect('input', ['type', 'name', 'id', 'class', 'placeholder']),
+    buttons: collect('button', ['text', 'type', 'id', 'class']),
+    links: collect('a', ['text', 'href', 'id', 'class'])
+};
+"""
+
+# Returns Navigation, Resource and Paint timing entries not yet returned for the current document
+PERFORMANCE_ENTRIES_SCRIPT = """
+var seen = window.__debuggerTraceSeen || (window.__debuggerTraceSeen = {navigation: false, resources: 0, paint: 0});
+var result = {time_origin: performance.timeOrigin, navigation: [], resources: [], paint: []};
+var navigation = performance.getEntriesByType('navigation');
+if (!seen.navigation && navigation.length && navigation[0].loadEventEnd > 0) {
+    result.navigation = [navigation[0].toJSON()];
+    seen.navigation = true;
+}
+var resources = performance.getEntriesByType('resource');
+result.resources = resources.slice(seen.resources).map(function(entry) { return entry.toJSON(); });
+seen.resources = resources.length;
+var paint = performance.getEntriesByType('paint');
+result.paint = paint.slice(seen.paint).map(function(entry) { return entry.toJSON(); });
+seen.paint = paint.length;
+return result;
+"""
+
+class HTTPResponse:
+    """A fully read response with the requests-style attributes the API paths use"""
+    
+    def __init__(self, status_code, reason, headers, content, headers_seconds):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        # Time from sending the request to having the status line and headers
+        self.headers_seconds = headers_seconds
+    
+    @property
+    def ok(self):
+        return self.status_code < 400
+    
+    def json(self):
+        return json.loads(self.content)
+
+class HTTPClient:
+    """Keep-alive HTTP/1.1 client built on http.client, one per thread; avoids importing requests at startup"""
+    
+    # A kept-alive connection the server already closed fails on reuse with one of these; the request is retried once
+    # (http.client.RemoteDisconnected is a ConnectionResetError)
+    STALE_CONNECTION_ERRORS = (BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+    
+    def __init__(self, base_url, timeout=30):
+        parsed = urlparse(base_url)
+        self.https = parsed.scheme == "https"
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip("/")
+        self.timeout = timeout
+        self.connection = None
+    
+    def connect(self):
+        import http.client
+        connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout)
+    
+    def request(self, method, path, payload=None, params=None, data=None, headers=None):
+        """Send a request, JSON-encoding payload unless raw data is given, and return the fully read HTTPResponse"""
+        import http.client
+        url = self.base_path + path + (f"?{urlencode(params)}" if params else "")
+        body = data if data is not None else json.dumps(payload).encode('utf-8') if payload is not None else None
+        extra_headers = headers or {}
+        headers = {"Accept": "application/json"}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        headers.update(extra_headers)
+        
+        for attempt in range(2):
+            reused = self.connection is not None
+            if not reused:
+                self.connection = self.connect()
+            started = time.perf_counter()
+            try:
+                self.connection.request(method, url, body=body, headers=headers)
+                response = self.connection.getresponse()
+                headers_seconds = time.perf_counter() - started
+                content = response.read()
+            except self.STALE_CONNECTION_ERRORS:
+                self.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except OSError:
+                self.close()
+                raise
+            except http.client.HTTPException as e:
+                self.close()
+                raise HTTPClientError(f"{type(e).__name__}: {e}") from e
+            if response.will_close:
+                self.close()
+            return HTTPResponse(response.status, response.reason, dict(response.getheaders()), content, headers_seconds)
+    
+    def get(self, path, params=None, headers=None):
+        return self.request("GET", path, params=params, headers=headers)
+    
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+class LatencyHistogram:
+    """Mergeable HDR-style log-linear histogram of durations, kept in microseconds with under 1% relative error"""
+    
+    # 2**7 linear sub-buckets per power of two bounds the bucket width to 1/128 of its value
+    SUB_BUCKET_BITS = 7
+    
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+    
+    def bucket_floor(self, value):
+        """Return the lowest value that shares a bucket with value"""
+        shift = max(0, value.bit_length() - self.SUB_BUCKET_BITS)
+        return (value >> shift) << shift
+    
+    def bucket_ceiling(self, floor):
+        """Return the highest value that shares a bucket with floor"""
+        shift = max(0, floor.bit_length() - self.SUB_BUCKET_BITS)
+        return floor + (1 << shift) - 1
+    
+    def record(self, seconds):
+        """Record one duration given in seconds"""
+        value = max(0, int(round(seconds * 1_000_000)))
+        floor = self.bucket_floor(value)
+        self.counts[floor] = self.counts.get(floor, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+    
+    def merge(self, other):
+        """Add another histogram's samples into this one"""
+        for floor, count in other.counts.items():
+            self.counts[floor] = self.counts.get(floor, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+    
+    def value_at_percentile(self, pct):
+        """Return the duration in seconds at or below which pct percent of samples fall"""
+        if not self.count:
+            return None
+        target = max(1, math.ceil(pct / 100.0 * self.count))
+        seen = 0
+        for floor in sorted(self.counts):
+            seen += self.counts[floor]
+            if seen >= target:
+                return min(self.bucket_ceiling(floor), self.max) / 1_000_000
+        return self.max / 1_000_000
+    
+    def summary(self):
+        """Return count, mean and p50/p90/p99/max in seconds"""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count / 1_000_000 if self.count else None,
+            "p50": self.value_at_percentile(50),
+            "p90": self.value_at_percentile(90),
+            "p99": self.value_at_percentile(99),
+            "max": self.max / 1_000_000 if self.count else None
+        }
+    
+    def to_dict(self):
+        """Serialize to a JSON-friendly dict that from_dict can merge back"""
+        return {
+            "count": self.count,
+            "total_us": self.total,
+            "min_us": self.min,
+            "max_us": self.max,
+            "buckets": sorted(self.counts.items())
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a histogram serialized with to_dict"""
+        histogram = cls()
+        histogram.counts = {int(floor): count for floor, count in data["buckets"]}
+        histogram.count = data["count"]
+        histogram.total = data["total_us"]
+        histogram.min = data["min_us"]
+        histogram.max = data["max_us"]
+        return histogram
+
+class ResultsSummary:
+    """Running aggregates over account results, so reports don't need every result held in memory"""
+    
+    def __init__(self):
+        self.total_accounts = 0
+        self.successful_registrations = 0
+        self.successful_logins = 0
+        self.total_translations = 0
+        self.successful_translations = 0
+        self.phase_timings = {}
+        self.skipped_steps = {}
+    
+    def add(self, result):
+        """Fold one account result into the aggregates"""
+        self.total_accounts += 1
+        self.successful_registrations += bool(result['registration_success'])
+        self.successful_logins += bool(result['login_success'])
+        self.total_translations += len(result['translations'])
+        self.successful_translations += sum(1 for t in result['translations'] if t['success'])
+        for phase, data in result.get("timings", {}).items():
+            self.phase_timings.setdefault(phase, LatencyHistogram()).merge(LatencyHistogram.from_dict(data))
+        for skip in result.get("skipped_steps", []):
+            key = (skip["step"], skip["reason"])
+            self.skipped_steps[key] = self.skipped_steps.get(key, 0) + 1
+    
+    @classmethod
+    def from_results(cls, results):
+        """Aggregate an iterable of account results"""
+        summary = cls()
+        for result in results:
+            summary.add(result)
+        return summary
+
+def open_results_file(path, mode):
+    """Open a JSON Lines results file, transparently handling .gz compression"""
+    if path.endswith('.gz'):
+        import gzip
+        return gzip.open(path, mode, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+def read_results(path, status=None):
+    """Yield every intact result in a results file; a torn final record from a crash is skipped and flagged in status"""
+    try:
+        with open_results_file(path, 'rt') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    break
+            else:
+                return
+    except (EOFError, OSError) as e:
+        # A gzip stream cut off mid-member still yields everything flushed before the crash
+        logger.warning(f"Results file {path} ends early: {e}")
+    if status is not None:
+        status["truncated"] = True
+
+class ResultsWriter:
+    """Streams account results to a JSON Lines file (gzip-compressed for .gz paths) as each account finishes"""
+    
+    def __init__(self, path='medical_terms_debug_results.jsonl', resume=False):
+        self.path = path
+        self.compress = path.endswith('.gz')
+        self.summary = ResultsSummary()
+        self.completed = set()
+        self.lock = threading.Lock()
+        self.truncated = False
+        
+        if resume and os.path.exists(path):
+            self.load_existing()
+        else:
+            self.open_file('wt').close()
+        self.file = self.open_file('at')
+    
+    def open_file(self, mode):
+        """Open the results file, transparently handling compression"""
+        return open_results_file(self.path, mode)
+    
+    def iter_results(self):
+        """Yield every intact result in the file; a torn final record from a crash is skipped"""
+        status = {}
+        yield from read_results(self.path, status)
+        if status.get("truncated"):
+            self.truncated = True
+    
+    def load_existing(self):
+        """Rebuild aggregates and the set of finished accounts from a partial file"""
+        for result in self.iter_results():
+            self.summary.add(result)
+            self.completed.add(result['account']['username'])
+        
+        if self.truncated:
+            # Rewrite only the intact records so new appends don't land after a torn line
+            temp_path = f"{self.path}.tmp" + ('.gz' if self.compress else '')
+            with open_results_file(temp_path, 'wt') as out:
+                for result in self.iter_results():
+                    out.write(json.dumps(result, default=str) + '\n')
+            os.replace(temp_path, self.path)
+            self.truncated = False
+        logger.info(f"Resuming from {self.path}: {len(self.completed)} accounts already completed")
+    
+    def write(self, result):
+        """Append one result and update the running aggregates"""
+        line = json.dumps(result, default=str) + '\n'
+        with self.lock:
+            self.file.write(line)
+            self.file.flush()
+            self.summary.add(result)
+            self.completed.add(result['account']['username'])
+    
+    def close(self):
+        """Flush and close the results file"""
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+class ResultsReader:
+    """Read-only counterpart of ResultsWriter, so a report can be regenerated from an earlier run's results file"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.summary = ResultsSummary.from_results(self.iter_results())
+    
+    def iter_results(self):
+        # Non-streamed runs save a single JSON array rather than JSON Lines
+        if self.path.endswith('.json'):
+            with open(self.path) as f:
+                return iter(json.load(f))
+        return read_results(self.path)
+    
+    def close(self):
+        pass
+
+def format_share(part, total, empty):
+    """Format part/total with its percentage, or the empty text when there is nothing to divide by"""
+    if not total:
+        return empty
+    return f"{part}/{total} ({part/total*100:.1f}%)"
+
+def format_latency(summary):
+    """Format a histogram summary as a single report line"""
+    if not summary['count']:
+        return "n=0"
+    return (f"n={summary['count']} p50={summary['p50']:.3f}s p90={summary['p90']:.3f}s "
+            f"p99={summary['p99']:.3f}s max={summary['max']:.3f}s")
+
+class TraceRecorder:
+    """Collects an account's phase, network and page timing spans and exports them in Chrome trace event format"""
+    
+    # (span name, start field, end field) for the connection stages of a Navigation timing entry
+    ENTRY_STAGES = [
+        ("dns", "domainLookupStart", "domainLookupEnd"),
+        ("connect", "connectStart", "connectEnd"),
+        ("ttfb", "requestStart", "responseStart"),
+        ("download", "responseStart", "responseEnd")
+    ]
+    NAVIGATION_MARKS = ["domInteractive", "domContentLoadedEventEnd", "loadEventEnd"]
+    
+    def __init__(self):
+        self.spans = []
+        self.requests = {}
+    
+    def add_span(self, name, category, start, end, args=None):
+        """Record a span between two wall-clock times in seconds"""
+        if start is None or end is None or end < start:
+            return
+        span = {"name": name, "cat": category, "start": round(start, 6), "end": round(end, 6)}
+        if args:
+            span["args"] = args
+        self.spans.append(span)
+    
+    def add_performance_log(self, entries):
+        """Fold DevTools Network events from Chrome's performance log into per-request state"""
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                request = self.requests.setdefault(params["requestId"], {})
+                request.update({
+                    "url": params["request"]["url"],
+                    "method": params["request"]["method"],
+                    "type": params.get("type"),
+                    "start": params["wallTime"],
+                    # CDP timestamps are monotonic; wallTime - timestamp maps them onto the wall clock
+                    "clock_offset": params["wallTime"] - params["timestamp"]
+                })
+            elif method == "Network.responseReceived":
+                request = self.requests.setdefault(params["requestId"], {})
+                response = params["response"]
+                request.update({"status": response.get("status"), "timing": response.get("timing"), "protocol": response.get("protocol")})
+            elif method == "Network.loadingFinished":
+                self.requests.setdefault(params["requestId"], {}).update({
+                    "finished": params["timestamp"], "encoded_length": params.get("encodedDataLength")
+                })
+            elif method == "Network.loadingFailed":
+                self.requests.setdefault(params["requestId"], {}).update({
+                    "finished": params["timestamp"], "error": params.get("errorText")
+                })
+        self.flush_requests()
+    
+    def flush_requests(self):
+        """Turn every finished request into a request span with dns/connect/ttfb/download children"""
+        for request_id in [request_id for request_id, request in self.requests.items() if "finished" in request and "start" in request]:
+            request = self.requests.pop(request_id)
+            offset = request["clock_offset"]
+            end = request["finished"] + offset
+            args = {key: request[key] for key in ("url", "method", "type", "status", "protocol", "encoded_length", "error") if request.get(key) is not None}
+            self.add_span(f"{request['method']} {urlparse(request['url']).path or '/'}", "network", request["start"], end, args)
+            
+            timing = request.get("timing")
+            if not timing:
+                continue
+            # Connection stage offsets are milliseconds from requestTime; -1 means the stage did not happen
+            base = timing["requestTime"] + offset
+            def at(field):
+                value = timing.get(field, -1)
+                return base + value / 1000 if value >= 0 else None
+            self.add_span("dns", "network.stage", at("dnsStart"), at("dnsEnd"))
+            self.add_span("connect", "network.stage", at("connectStart"), at("connectEnd"))
+            self.add_span("ttfb", "network.stage", at("sendStart"), at("receiveHeadersEnd"))
+            self.add_span("download", "network.stage", at("receiveHeadersEnd"), end)
+    
+    def add_performance_entries(self, entries):
+        """Record Navigation, Resource and Paint timing entries returned by PERFORMANCE_ENTRIES_SCRIPT"""
+        origin = entries["time_origin"] / 1000
+        def at(entry, field):
+            value = entry.get(field) or 0
+            return origin + value / 1000 if value > 0 else None
+        
+        for entry in entries["navigation"]:
+            self.add_span("navigation", "page", at(entry, "startTime") or origin, at(entry, "loadEventEnd"),
+                          {"url": entry["name"], "type": entry.get("type"), "transfer_size": entry.get("transferSize")})
+            for name, start, end in self.ENTRY_STAGES:
+                self.add_span(name, "page.stage", at(entry, start), at(entry, end))
+            for mark in self.NAVIGATION_MARKS:
+                self.add_span(mark, "page.mark", at(entry, mark), at(entry, mark))
+        for entry in entries["resources"]:
+            start = origin + entry["startTime"] / 1000
+            self.add_span(urlparse(entry["name"]).path or "/", "resource", start, start + entry["duration"] / 1000,
+                          {"url": entry["name"], "initiator": entry.get("initiatorType"), "transfer_size": entry.get("transferSize")})
+        for entry in entries["paint"]:
+            start = origin + entry["startTime"] / 1000
+            self.add_span(entry["name"], "paint", start, start)
+    
+    def finish(self):
+        """Return the recorded spans in start order, flushing requests that never finished"""
+        for request in self.requests.values():
+            request.setdefault("finished", request.get("start", 0) - request.get("clock_offset", 0))
+        self.flush_requests()
+        return sorted(self.spans, key=lambda span: span["start"])
+    
+    @staticmethod
+    def to_trace_events(spans, pid, tid, thread_name):
+        """Convert spans to Chrome trace event format complete events on one thread"""
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}}]
+        for span in spans:
+            event = {
+                "name": span["name"], "cat": span["cat"], "ph": "X", "pid": pid, "tid": tid,
+                "ts": int(span["start"] * 1e6), "dur": int((span["end"] - span["start"]) * 1e6)
+            }
+            if "args" in span:
+                event["args"] = span["args"]
+            events.append(event)
+        return events
+
+class LocatorCache:
+    """Remembers, per page route and logical field, the strategy and selector that last located it"""
+    
+    def __init__(self, path='medical_terms_locator_cache.json', miss_ttl=60):
+        self.path = path
+        self.entries = {}
+        # Recent misses, kept in memory only, so a slow render can't mark a field missing for future runs
+        self.miss_ttl = miss_ttl
+        self.misses = {}
+        self.lock = threading.Lock()
+        self.dirty = False
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    entries = json.load(f)
+                # Older cache files stored misses; they are dropped so the field gets its full wait again
+                self.entries = {key: entry for key, entry in entries.items() if not entry.get("missing")}
+                self.dirty = len(self.entries) != len(entries)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable locator cache {path}: {e}")
+    
+    def key(self, url, field):
+        """Build the cache key from the URL's route and the field name"""
+        return f"{urlparse(url).path or '/'}::{field}"
+    
+    def get(self, url, field):
+        """Return the cached entry for a field on this route, or None"""
+        with self.lock:
+            return self.entries.get(self.key(url, field))
+    
+    def recently_missing(self, url, field):
+        """Return whether the field could not be found on this route within the last miss_ttl seconds"""
+        with self.lock:
+            expires = self.misses.get(self.key(url, field))
+            return expires is not None and expires > time.monotonic()
+    
+    def remember(self, url, field, strategy_key, selector):
+        """Record the strategy and selector that just located a field"""
+        entry = {"strategy": strategy_key, "selector": selector}
+        with self.lock:
+            key = self.key(url, field)
+            self.misses.pop(key, None)
+            if self.entries.get(key) != entry:
+                self.entries[key] = entry
+                self.dirty = True
+    
+    def invalidate(self, url, field):
+        """Drop a field's entry after it could not be found, and note the miss for miss_ttl seconds"""
+        with self.lock:
+            key = self.key(url, field)
+            self.misses[key] = time.monotonic() + self.miss_ttl
+            if self.entries.pop(key, None) is not None:
+                self.dirty = True
+    
+    def save(self):
+        """Persist the cache so later runs start from what this run learned"""
+        with self.lock:
+            if not self.path or not self.dirty:
+                return
+            with open(self.path, 'w') as f:
+                json.dump(self.entries, f, indent=2, sort_keys=True)
+            self.dirty = False
+
+# Requests for these never affect the flows under test, so --block-assets drops them at the network layer
+BLOCKED_ASSET_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*google-analytics.com*", "*googletagmanager.com*", "*/_vercel/insights/*", "*/_vercel/speed-insights/*",
+    "*js.stripe.com*", "*m.stripe.network*", "*m.stripe.com*"
+]
+
+class DriverPool:
+    """Pre-warmed WebDriver sessions handed out to workers; a session is only restarted after a crash or max_uses accounts"""
+    
+    def __init__(self, factory, size, max_uses=None):
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.idle = queue.Queue()
+        self.uses = {}
+        self.lock = threading.Lock()
+    
+    def start(self):
+        """Start all sessions in parallel; setup alone takes several seconds per driver"""
+        errors = []
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(self.factory) for _ in range(self.size)]
+            for future in as_completed(futures):
+                try:
+                    self.add(future.result())
+                except Exception as e:
+                    errors.append(e)
+        
+        if not self.uses:
+            raise errors[0]
+        if errors:
+            logger.warning(f"Only {len(self.uses)}/{self.size} browser sessions started: {errors[0]}")
+        logger.info(f"Driver pool ready with {len(self.uses)} browser sessions")
+        return self
+    
+    def add(self, driver):
+        """Put a fresh driver into the pool"""
+        with self.lock:
+            self.uses[driver] = 0
+        self.idle.put(driver)
+    
+    def acquire(self):
+        """Take an idle driver, waiting for one to be released if necessary"""
+        while True:
+            try:
+                return self.idle.get(timeout=1)
+            except queue.Empty:
+                with self.lock:
+                    if not self.uses:
+                        raise RuntimeError("Driver pool has no live browser sessions left")
+    
+    def release(self, driver, healthy=True):
+        """Return a driver after use, replacing it if it crashed or reached max_uses"""
+        with self.lock:
+            self.uses[driver] += 1
+            worn_out = self.max_uses and self.uses[driver] >= self.max_uses
+        if healthy and not worn_out:
+            self.idle.put(driver)
+            return
+        
+        logger.info(f"Restarting browser session ({'worn out' if healthy else 'crashed'})")
+        self.discard(driver)
+        try:
+            self.add(self.factory())
+        except Exception as e:
+            logger.error(f"Could not replace browser session: {e}")
+    
+    def discard(self, driver):
+        """Remove a driver from the pool and quit it"""
+        with self.lock:
+            self.uses.pop(driver, None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error closing WebDriver: {e}")
+    
+    def close(self):
+        """Quit every session in the pool"""
+        with self.lock:
+            drivers = list(self.uses)
+        for driver in drivers:
+            self.discard(driver)
+        logger.info(f"Closed {len(drivers)} browser sessions")
+
+def normalize_text(text):
+    """Normalize text for deduplication and cache keys: NFKC, lowercase, collapsed whitespace"""
+    return " ".join(unicodedata.normalize("NFKC", text).lower().split())
+
+class TermCorpus:
+    """Term and sentence files streamed lazily from disk, planned so each text/model pair is translated once per run"""
+    
+    def __init__(self, paths, models=None, partition=None):
+        self.paths = list(paths)
+        self.models = list(models or [None])
+        # (index, count): only plan texts whose digest falls in this slice, so sharded processes never overlap
+        self.partition = partition
+        self.planned = 0
+        self.duplicates = 0
+        self._plan = None
+        self._lock = threading.Lock()
+    
+    def iter_texts(self):
+        """Yield one term or sentence per non-blank, non-comment line; .gz files are decompressed on the fly"""
+        import gzip
+        for path in self.paths:
+            opener = gzip.open if path.endswith('.gz') else open
+            with opener(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    text = line.strip()
+                    if text and not text.startswith('#'):
+                        yield text
+    
+    def iter_plan(self):
+        """Yield (text, model) pairs covering every distinct text with every model exactly once"""
+        import hashlib
+        # 8-byte digests keep the seen-set small even for corpora of millions of lines
+        seen = set()
+        for text in self.iter_texts():
+            digest = hashlib.blake2b(normalize_text(text).encode('utf-8'), digest_size=8).digest()
+            if self.partition and int.from_bytes(digest, 'big') % self.partition[1] != self.partition[0]:
+                continue
+            if digest in seen:
+                self.duplicates += 1
+                continue
+            seen.add(digest)
+            for model in self.models:
+                self.planned += 1
+                yield text, model
+    
+    def take(self, count):
+        """Hand out the next count planned pairs; shared safely between worker threads"""
+        with self._lock:
+            if self._plan is None:
+                self._plan = self.iter_plan()
+            return list(itertools.islice(self._plan, count))
+
+class TranslationCache:
+    """SQLite store of translate responses keyed by (normalized text, model), diffable against a golden snapshot"""
+    
+    def __init__(self, path='medical_terms_translations.sqlite3'):
+        import sqlite3
+        self.path = path
+        self.lock = threading.Lock()
+        # Sharded runs share the file between processes, so wait out other writers' locks
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                text_key TEXT NOT NULL,
+                model TEXT NOT NULL,
+                text TEXT NOT NULL,
+                explanation TEXT NOT NULL,
+                updated TEXT NOT NULL,
+                PRIMARY KEY (text_key, model)
+            )
+        """)
+        self.conn.commit()
+    
+    def get(self, text, model):
+        """Return the cached explanation for a text/model pair, or None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT explanation FROM translations WHERE text_key = ? AND model = ?",
+                (normalize_text(text), model or "")
+            ).fetchone()
+        return row[0] if row else None
+    
+    def put(self, text, model, explanation):
+        """Store or replace the explanation for a text/model pair"""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+                (normalize_text(text), model or "", text, explanation, datetime.now().isoformat())
+            )
+            self.conn.commit()
+    
+    def diff(self, golden_path):
+        """Compare stored responses against a golden cache file made by an earlier run"""
+        with self.lock:
+            self.conn.execute("ATTACH DATABASE ? AS golden", (golden_path,))
+            try:
+                changed = self.conn.execute("""
+                    SELECT t.text, t.model, g.explanation, t.explanation
+                    FROM translations t JOIN golden.translations g USING (text_key, model)
+                    WHERE t.explanation != g.explanation
+                """).fetchall()
+                missing = self.conn.execute("""
+                    SELECT g.text, g.model FROM golden.translations g
+                    WHERE NOT EXISTS (SELECT 1 FROM translations t WHERE t.text_key = g.text_key AND t.model = g.model)
+                """).fetchall()
+                new = self.conn.execute("""
+                    SELECT COUNT(*) FROM translations t
+                    WHERE NOT EXISTS (SELECT 1 FROM golden.translations g WHERE g.text_key = t.text_key AND g.model = t.model)
+                """).fetchone()[0]
+                unchanged = self.conn.execute("""
+                    SELECT COUNT(*) FROM translations t JOIN golden.translations g USING (text_key, model)
+                    WHERE t.explanation = g.explanation
+                """).fetchone()[0]
+            finally:
+                self.conn.execute("DETACH DATABASE golden")
+        return {
+            "golden": golden_path,
+            "unchanged": unchanged,
+            "new": new,
+            "changed": [
+                {"text": text, "model": model or None, "golden": golden, "current": current}
+                for text, model, golden, current in changed
+            ],
+            "missing": [{"text": text, "model": model or None} for text, model in missing]
+        }
+    
+    def close(self):
+        """Close the underlying database"""
+        with self.lock:
+            self.conn.close()
+
+class AccountFactory:
+    """Seeded, reproducible test credentials generated lazily, with each account's lifecycle kept in an SQLite index"""
+    
+    ISSUED, REGISTERED, VERIFIED, RETIRED = range(4)
+    STATE_NAMES = ("issued", "registered", "verified", "retired")
+    FIRST_NAMES = ("Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie")
+    LAST_NAMES = ("Smith", "Lee", "Garcia", "Brown", "Patel", "Nguyen", "Kim", "Lopez")
+    
+    def __init__(self, seed=0, index_path='medical_terms_accounts.sqlite3', prefix='mt'):
+        import hashlib
+        import sqlite3
+        self.seed = seed
+        self.key = hashlib.blake2b(str(seed).encode('utf-8'), digest_size=16).digest()
+        # Every username carries the seed's tag, so a whole seed's accounts can be found with one LIKE
+        self.tag = f"{prefix}{self.key.hex()[:6]}"
+        self.index_path = index_path
+        self.started = int(time.time())
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(index_path, check_same_thread=False, timeout=30)
+        # Usernames and passwords are derived from (seed, n), so the index stores only state, not credentials
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS accounts (
+                seed INTEGER NOT NULL,
+                n INTEGER NOT NULL,
+                state INTEGER NOT NULL,
+                user_id TEXT,
+                quota_used INTEGER NOT NULL DEFAULT 0,
+                updated INTEGER NOT NULL,
+                PRIMARY KEY (seed, n)
+            ) WITHOUT ROWID
+        """)
+        self.conn.commit()
+    
+    def account(self, n):
+        """Return the credentials for account number n of this seed"""
+        import hashlib
+        digest = hashlib.blake2b(n.to_bytes(8, 'big'), key=self.key, digest_size=12).digest()
+        username = f"{self.tag}_{n}"
+        return {
+            "username": username,
+            "password": f"Mt{digest.hex()}!",
+            "email": f"{username}@example.com",
+            "first_name": self.FIRST_NAMES[digest[0] % len(self.FIRST_NAMES)],
+            "last_name": self.LAST_NAMES[digest[1] % len(self.LAST_NAMES)]
+        }
+    
+    def generate(self, count, start=0):
+        """Yield count accounts starting at number start, without touching the index"""
+        for n in range(start, start + count):
+            yield self.account(n)
+    
+    def number(self, username):
+        """Return the account number encoded in one of this seed's usernames, or None"""
+        tag, _, n = username.rpartition("_")
+        return int(n) if tag == self.tag and n.isdigit() else None
+    
+    def fresh(self, count):
+        """Yield count unused accounts, marking each issued; issued accounts an earlier run never registered are handed out first"""
+        remaining = count
+        while remaining > 0:
+            numbers = self._reserve(min(remaining, 1000))
+            remaining -= len(numbers)
+            for n in numbers:
+                yield self.account(n)
+    
+    def issue_one(self):
+        """Return one unused account, recorded as issued before it is handed out"""
+        return self.account(self._reserve(1)[0])
+    
+    def _reserve(self, count):
+        # Numbers are picked and recorded in one locked section, so concurrent callers never share an account
+        now = int(time.time())
+        with self.lock:
+            # Leftovers issued since this factory started belong to the current run and may still be in use
+            leftover = [row[0] for row in self.conn.execute(
+                "SELECT n FROM accounts WHERE seed = ? AND state = ? AND updated < ? ORDER BY n LIMIT ?",
+                (self.seed, self.ISSUED, self.started, count)
+            )]
+            next_n = self.conn.execute("SELECT COALESCE(MAX(n) + 1, 0) FROM accounts WHERE seed = ?", (self.seed,)).fetchone()[0]
+            numbers = leftover + list(range(next_n, next_n + count - len(leftover)))
+            self.conn.executemany("""
+                INSERT INTO accounts (seed, n, state, updated) VALUES (?, ?, ?, ?)
+                ON CONFLICT (seed, n) DO UPDATE SET updated = excluded.updated
+            """, [(self.seed, n, self.ISSUED, now) for n in numbers])
+            self.conn.commit()
+        return numbers
+    
+    def warm(self, count, quota_limit=None):
+        """Return up to count verified accounts with their user ids, skipping ones whose translation quota is spent"""
+        query = "SELECT n, user_id, quota_used FROM accounts WHERE seed = ? AND state = ? AND user_id IS NOT NULL"
+        params = [self.seed, self.VERIFIED]
+        if quota_limit is not None and quota_limit >= 0:
+            query += " AND quota_used < ?"
+            params.append(quota_limit)
+        with self.lock:
+            rows = self.conn.execute(query + " ORDER BY quota_used, n LIMIT ?", params + [count]).fetchall()
+        return [
+            dict(self.account(n), user_id=user_id, quota_used=quota_used,
+                 remaining=quota_limit - quota_used if quota_limit is not None and quota_limit >= 0 else None)
+            for n, user_id, quota_used in rows
+        ]
+    
+    def record_result(self, result):
+        """Advance an account's state from a finished account result"""
+        n = self.number(result["account"]["username"])
+        if n is None:
+            return
+        if result.get("login_success"):
+            state = self.VERIFIED
+        elif result.get("registration_success"):
+            state = self.REGISTERED
+        else:
+            state = self.ISSUED
+        used = sum(1 for translation in result.get("translations", []) if translation.get("success"))
+        with self.lock:
+            self.conn.execute("""
+                INSERT INTO accounts (seed, n, state, user_id, quota_used, updated) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (seed, n) DO UPDATE SET
+                    state = MAX(state, excluded.state),
+                    user_id = COALESCE(excluded.user_id, user_id),
+                    quota_used = quota_used + excluded.quota_used,
+                    updated = excluded.updated
+            """, (self.seed, n, state, result.get("user_id"), used, int(time.time())))
+            self.conn.commit()
+    
+    def add_quota(self, usage):
+        """Add translation counts from a {user_id: count} map to the accounts that own those ids"""
+        with self.lock:
+            self.conn.executemany(
+                "UPDATE accounts SET quota_used = quota_used + ?, updated = ? WHERE seed = ? AND user_id = ?",
+                [(used, int(time.time()), self.seed, str(user_id)) for user_id, used in usage.items()]
+            )
+            self.conn.commit()
+    
+    def state_counts(self):
+        """Return how many of this seed's accounts are in each lifecycle state"""
+        with self.lock:
+            rows = self.conn.execute("SELECT state, COUNT(*) FROM accounts WHERE seed = ? GROUP BY state", (self.seed,)).fetchall()
+        return {self.STATE_NAMES[state]: count for state, count in rows}
+    
+    def cleanup(self, sql_path='medical_terms_account_cleanup.sql'):
+        """Retire every account of this seed and write SQL that deletes them and their data from the app database"""
+        pattern = f"{self.tag}\\_%"
+        users = f"SELECT id FROM users WHERE username LIKE '{pattern}' ESCAPE '\\'"
+        with open(sql_path, 'w') as f:
+            f.write(f"-- Remove test accounts for seed {self.seed} (usernames {self.tag}_N)\n")
+            f.write("BEGIN;\n")
+            f.write(f"DELETE FROM laymen_terms WHERE submission_id IN (SELECT id FROM submissions WHERE user_id IN ({users}));\n")
+            f.write(f"DELETE FROM submissions WHERE user_id IN ({users});\n")
+            f.write(f"DELETE FROM user_subscriptions WHERE user_id IN ({users});\n")
+            f.write(f"DELETE FROM users WHERE username LIKE '{pattern}' ESCAPE '\\';\n")
+            f.write("COMMIT;\n")
+        with self.lock:
+            retired = self.conn.execute(
+                "UPDATE accounts SET state = ?, user_id = NULL, updated = ? WHERE seed = ? AND state != ?",
+                (self.RETIRED, int(time.time()), self.seed, self.RETIRED)
+            ).rowcount
+            self.conn.commit()
+        logger.info(f"Retired {retired} accounts for seed {self.seed}; run {sql_path} against the database to delete them")
+        return retired
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+class QuotaScheduler:
+    """Hands out translation attempts to the account with the most remaining quota, as reported by /api/translate"""
+    
+    def __init__(self, default_remaining=5, reserve=0):
+        # Accounts nobody has translated with yet are assumed to have the free tier's quota
+        self.default_remaining = default_remaining
+        self.reserve = reserve
+        self.lock = threading.Lock()
+        self.accounts = {}
+        self.heap = []
+        self.sequence = itertools.count()
+        self.tiers = {}
+    
+    def add(self, user_id, remaining=None, limit=None):
+        """Put an account into rotation, optionally with its known remaining quota"""
+        with self.lock:
+            self.accounts[user_id] = {
+                "remaining": self.default_remaining if remaining is None else remaining,
+                "limit": limit,
+                "in_flight": 0,
+                "version": 0
+            }
+            self._push(user_id)
+    
+    def _available(self, account):
+        if account["remaining"] < 0:
+            return math.inf
+        return account["remaining"] - account["in_flight"] - self.reserve
+    
+    def _push(self, user_id):
+        # Bumping the version makes every older heap entry for the account stale
+        account = self.accounts[user_id]
+        account["version"] += 1
+        available = self._available(account)
+        if available > 0:
+            heapq.heappush(self.heap, (-available, next(self.sequence), user_id, account["version"]))
+        # Stale entries that never reach the top would pile up for the whole run; drop them once they dominate
+        if len(self.heap) > 4 * len(self.accounts) + 16:
+            self.heap = [
+                (-self._available(account), next(self.sequence), user_id, account["version"])
+                for user_id, account in self.accounts.items() if self._available(account) > 0
+            ]
+            heapq.heapify(self.heap)
+    
+    def has_quota(self, user_id):
+        """Return whether an account can take another attempt without dipping into its reserve"""
+        with self.lock:
+            account = self.accounts.get(user_id)
+            return account is None or self._available(account) > 0
+    
+    def acquire(self):
+        """Reserve one attempt on the account with the most quota left, or return None when every account is spent"""
+        with self.lock:
+            while self.heap:
+                _, _, user_id, version = heapq.heappop(self.heap)
+                account = self.accounts[user_id]
+                # Entries are never updated in place, so skip ones made stale by later pushes
+                if version != account["version"]:
+                    continue
+                account["in_flight"] += 1
+                self._push(user_id)
+                return user_id
+            return None
+    
+    def release(self, user_id, status, body=None, acquired=True):
+        """Update an account from a translate response; acquired=False records a call made outside acquire()"""
+        body = body or {}
+        data = body.get("data") or {}
+        with self.lock:
+            account = self.accounts.setdefault(user_id, {"remaining": self.default_remaining, "limit": None, "in_flight": 0, "version": 0})
+            if acquired:
+                account["in_flight"] -= 1
+            # Partial responses carry a hard-coded subscription block, so only full answers and 403s are trusted
+            subscription = body.get("subscription") if status == 403 else (None if data.get("partial") else data.get("subscription"))
+            if status == 403:
+                account["remaining"] = 0
+            elif subscription and subscription.get("remaining") is not None:
+                account["remaining"] = subscription["remaining"]
+            elif status == 200 and account["remaining"] > 0:
+                account["remaining"] -= 1
+            if subscription and subscription.get("limit") is not None:
+                account["limit"] = subscription["limit"]
+            self._push(user_id)
+            
+            tier = self.tier_name(account["limit"])
+            stats = self.tiers.setdefault(tier, {"attempts": 0, "succeeded": 0, "limited": 0, "accounts": set()})
+            stats["attempts"] += 1
+            stats["succeeded"] += status == 200
+            stats["limited"] += status == 403
+            stats["accounts"].add(user_id)
+    
+    @staticmethod
+    def tier_name(limit):
+        if limit is None:
+            return "unknown"
+        if limit < 0:
+            return "unlimited"
+        return f"{limit}/month"
+    
+    def tier_report(self, elapsed):
+        """Return attempts, successes, 403s and throughput per quota tier"""
+        with self.lock:
+            return {
+                tier: {
+                    "accounts": len(stats["accounts"]),
+                    "attempts": stats["attempts"],
+                    "succeeded": stats["succeeded"],
+                    "limited": stats["limited"],
+                    "throughput": stats["succeeded"] / elapsed if elapsed else 0.0
+                }
+                for tier, stats in self.tiers.items()
+            }
+    
+    def exhausted(self):
+        """Return how many accounts have been rotated out because their quota is spent"""
+        with self.lock:
+            return sum(1 for account in self.accounts.values() if self._available(account) <= 0)
+
+class CircuitBreaker:
+    """Skips a step once it has failed the same way K times in a row, letting one account re-probe it with exponential backoff"""
+    
+    def __init__(self, threshold=3, backoff=30, max_backoff=600):
+        self.threshold = threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.steps = {}
+        self.lock = threading.Lock()
+    
+    @staticmethod
+    def signature(error):
+        """Reduce an error message to its first line with ids and timings masked, so repeats of one failure compare equal"""
+        lines = str(error).strip().splitlines()
+        # Short integers such as HTTP status codes are kept since they tell failures apart
+        return re.sub(r"\d+\.\d+|\d{4,}", "N", lines[0] if lines else "unknown failure")[:200]
+    
+    def allow(self, step):
+        """Return None when the step may run, or the failure it is open for"""
+        with self.lock:
+            state = self.steps.get(step)
+            if not state or state["open_until"] is None:
+                return None
+            if state["probing"] or time.monotonic() < state["open_until"]:
+                return state["signature"]
+            # Half-open: exactly one account probes the step; the rest keep skipping until it reports back
+            state["probing"] = True
+            logger.info(f"Circuit for {step} half-open: probing after {state['backoff']:.0f}s")
+            return None
+    
+    def record(self, step, ok, error=None):
+        """Report a step outcome, opening, re-opening or closing the step's circuit"""
+        with self.lock:
+            state = self.steps.setdefault(step, {"signature": None, "streak": 0, "open_until": None, "backoff": 0, "probing": False})
+            probing, state["probing"] = state["probing"], False
+            if ok:
+                if state["open_until"] is not None:
+                    logger.info(f"Circuit for {step} closed: step succeeded again")
+                state.update(signature=None, streak=0, open_until=None, backoff=0)
+                return
+            
+            signature = self.signature(error)
+            if signature == state["signature"]:
+                state["streak"] += 1
+            else:
+                state["signature"], state["streak"] = signature, 1
+            if probing:
+                state["backoff"] = min(state["backoff"] * 2, self.max_backoff)
+                state["open_until"] = time.monotonic() + state["backoff"]
+                logger.warning(f"Circuit for {step} re-opened for {state['backoff']:.0f}s: {signature}")
+            elif state["open_until"] is None and state["streak"] >= self.threshold:
+                state["backoff"] = self.backoff
+                state["open_until"] = time.monotonic() + state["backoff"]
+                logger.error(f"Circuit for {step} opened after {state['streak']} identical failures; skipping it: {signature}")
+
+class WorkQueue:
+    """Directory-backed queue of account chunks that local processes, or machines sharing the directory, drain"""
+    
+    def __init__(self, root):
+        self.root = root
+        for name in ("pending", "claimed", "done", "results"):
+            os.makedirs(os.path.join(root, name), exist_ok=True)
+    
+    def enqueue(self, accounts, chunk_size):
+        """Split accounts into numbered chunk files and return how many were written"""
+        chunks = 0
+        for start in range(0, len(accounts), chunk_size):
+            chunk = {"chunk_id": chunks, "accounts": accounts[start:start + chunk_size]}
+            path = os.path.join(self.root, "pending", f"chunk-{chunks:06d}.json")
+            with open(f"{path}.tmp", 'w') as f:
+                json.dump(chunk, f)
+            os.replace(f"{path}.tmp", path)
+            chunks += 1
+        with open(os.path.join(self.root, "queue.json"), 'w') as f:
+            json.dump({"chunks": chunks, "created": datetime.now().isoformat()}, f)
+        logger.info(f"Enqueued {len(accounts)} accounts as {chunks} chunks in {self.root}")
+        return chunks
+    
+    @property
+    def chunk_count(self):
+        with open(os.path.join(self.root, "queue.json")) as f:
+            return json.load(f)["chunks"]
+    
+    def claim(self):
+        """Atomically claim the next pending chunk, or return None when none are left"""
+        pending_dir = os.path.join(self.root, "pending")
+        for name in sorted(n for n in os.listdir(pending_dir) if n.endswith(".json")):
+            claimed_path = os.path.join(self.root, "claimed", name)
+            try:
+                # rename is atomic, so exactly one worker wins each chunk
+                os.rename(os.path.join(pending_dir, name), claimed_path)
+            except FileNotFoundError:
+                continue
+            with open(claimed_path) as f:
+                return json.load(f)
+        return None
+    
+    def complete(self, chunk_id):
+        """Mark a claimed chunk as done"""
+        name = f"chunk-{chunk_id:06d}.json"
+        os.replace(os.path.join(self.root, "claimed", name), os.path.join(self.root, "done", name))
+    
+    def requeue_claimed(self):
+        """Return chunks left claimed by dead workers to pending; their partial results are resumed"""
+        names = os.listdir(os.path.join(self.root, "claimed"))
+        for name in names:
+            os.replace(os.path.join(self.root, "claimed", name), os.path.join(self.root, "pending", name))
+        return len(names)
+    
+    def result_path(self, chunk_id):
+        return os.path.join(self.root, "results", f"chunk-{chunk_id:06d}.jsonl")
+    
+    def unfinished(self):
+        """Return how many chunks are still pending or claimed"""
+        return len(os.listdir(os.path.join(self.root, "pending"))) + len(os.listdir(os.path.join(self.root, "claimed")))
+    
+    def merge(self, output_path):
+        """Concatenate chunk results in chunk order into one results file and return its writer"""
+        writer = ResultsWriter(output_path)
+        for chunk_id in range(self.chunk_count):
+            path = self.result_path(chunk_id)
+            if os.path.exists(path):
+                for result in read_results(path):
+                    writer.write(result)
+        logger.info(f"Merged {writer.summary.total_accounts} account results into {output_path}")
+        return writer
+
+class MedicalTermsDebugger:
+    # Steps whose success is decided after their timed block; their log event waits for record_step
+    OUTCOME_STEPS = {"page_load", "registration", "login", "translation"}
+    
+    def __init__(self, num_accounts=10, workers=1, reuse_page_structure=False,
+                 locator_cache_path='medical_terms_locator_cache.json',
+                 recycle_sessions=False, max_driver_uses=None, block_assets=False, base_url=None,
+                 account_factory=None, trace=False):
+        self.base_url = (base_url or os.environ.get("MEDICAL_TERMS_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+        self.driver = None
+        self.wait = None
+        self.results = []
+        self.workers = max(1, workers)
+        self.element_timeout = 10
+        self.navigation_timeout = 10
+        self.result_timeout = 30
+        self.network_idle_time = 0.5
+        self._timing_state = threading.local()
+        self.reuse_page_structure = reuse_page_structure
+        self._last_page_structure = None
+        self.locator_cache = LocatorCache(locator_cache_path) if locator_cache_path else None
+        # Fields missed on their route within the locator cache's miss_ttl get a short wait instead of the full element_timeout
+        self.missing_field_timeout = 2
+        self.results_writer = None
+        self.recycle_sessions = recycle_sessions
+        self.max_driver_uses = max_driver_uses
+        self.block_assets = block_assets
+        self.trace = trace
+        self.circuit_breaker = None
+        # Runs check_website_accessibility before the first account; cron and CI callers may skip it
+        self.preflight = True
+        self.driver_pool = None
+        self.term_corpus = None
+        self.terms_per_account = 2
+        self.account_factory = account_factory
+        self.test_accounts = self.generate_test_accounts(num_accounts)
+        self.medical_terms = [
+            "hypertension", "diabetes", "pneumonia", "asthma", "arthritis",
+            "bronchitis", "myocardial infarction", "cerebrovascular accident",
+            "gastroenteritis", "dermatitis", "nephritis", "hepatitis",
+            "osteoporosis", "fibromyalgia", "tachycardia", "bradycardia",
+            "hypoglycemia", "hyperglycemia", "anemia", "leukemia"
+        ]
+        
+    def generate_test_accounts(self, count=10):
+        """Generate test accounts with different usernames and passwords"""
+        if self.account_factory:
+            return list(self.account_factory.fresh(count))
+        accounts = []
+        for i in range(1, count + 1):
+            account = {
+                "username": f"testuser{i}",
+                "password": f"SecurePass{i}!",
+                "email": f"test{i}@example.com",
+                "first_name": f"Test{i}",
+                "last_name": f"User{i}"
+            }
+            accounts.append(account)
+        return accounts
+    
+    def create_driver(self):
+        """Create a new headless Chrome WebDriver session"""
+        import_selenium()
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")  # Run in background
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+        if self.block_assets:
+            # Disabling images at the content-settings level stops them from being requested at all
+            chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        if self.trace:
+            # DevTools Network events are buffered in the performance log and drained after each phase
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+        
+        try:
+            driver = webdriver.Chrome(options=chrome_options)
+            if self.block_assets:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_ASSET_PATTERNS})
+            logger.info("Chrome WebDriver initialized successfully")
+            return driver
+        except Exception as e:
+            logger.error(f"Failed to initialize WebDriver: {e}")
+            raise
+    
+    def setup_driver(self):
+        """Setup Chrome WebDriver with appropriate options"""
+        self.driver = self.create_driver()
+        self.wait = WebDriverWait(self.driver, 10)
+    
+    def reset_browser_state(self):
+        """Clear cookies, localStorage and sessionStorage so the next account starts from a logged-out session"""
+        parsed = urlparse(self.base_url)
+        try:
+            self.driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                "origin": f"{parsed.scheme}://{parsed.netloc}",
+                "storageTypes": "cookies,local_storage,session_storage,indexeddb,service_workers"
+            })
+        except Exception as e:
+            logger.debug(f"CDP storage reset unavailable: {e}")
+        self.driver.delete_all_cookies()
+        self.driver.execute_script("try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+    
+    def is_driver_alive(self, driver):
+        """Return whether a WebDriver session still responds"""
+        try:
+            driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+    
+    def close_driver(self):
+        """Quit the WebDriver session if one is open"""
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.warning(f"Error closing WebDriver: {e}")
+            self.driver = None
+            self.wait = None
+    
+    def check_website_accessibility(self, session=None):
+        """Check if the website is accessible, over a kept-alive HTTPClient when one is given"""
+        client = session or HTTPClient(self.base_url, timeout=10)
+        try:
+            response = client.get("/")
+            logger.info(f"Website status code: {response.status_code}")
+            # Redirects are not followed; a redirect still means the site answered
+            return response.status_code < 400
+        except Exception as e:
+            logger.error(f"Website accessibility check failed: {e}")
+            return False
+        finally:
+            if session is None:
+                client.close()
+    
+    @contextmanager
+    def time_phase(self, phase):
+        """Record the duration of a phase into the current account's histograms, and as a span when tracing"""
+        started = time.perf_counter()
+        started_at = time.time()
+        outcome = "error"
+        try:
+            yield
+            outcome = "ok"
+        finally:
+            duration = time.perf_counter() - started
+            timings = getattr(self._timing_state, "timings", None)
+            if timings is not None:
+                timings.setdefault(phase, LatencyHistogram()).record(duration)
+            pending_steps = getattr(self._timing_state, "pending_steps", None)
+            if pending_steps is not None and phase in self.OUTCOME_STEPS and outcome == "ok":
+                # Completed steps can still have failed; record_step logs them once the outcome is known
+                pending_steps[phase] = duration
+            else:
+                self.log_step_event(phase, duration, outcome)
+            recorder = getattr(self._timing_state, "trace", None)
+            if recorder is not None:
+                recorder.add_span(phase, "phase", started_at, time.time())
+                self.collect_browser_trace(recorder)
+    
+    def log_step_event(self, phase, duration, outcome, error=None):
+        """Write one structured step event to the JSON log file"""
+        account = getattr(self._timing_state, "account", None)
+        event = {"event": "step", "account": account, "phase": phase, "duration": round(duration, 6), "outcome": outcome}
+        if error:
+            event["error"] = str(error)[:200]
+        logger.info(f"{phase} {outcome} in {duration:.3f}s for {account}", extra={"event": event})
+    
+    def start_account_timings(self, account=None):
+        """Begin collecting phase timings for the account running on this thread"""
+        self._timing_state.timings = {}
+        self._timing_state.account = account["username"] if account else None
+        self._timing_state.pending_steps = {}
+        if self.trace:
+            self._timing_state.trace = TraceRecorder()
+            if self.driver:
+                # Drop events left over from the previous account on this session
+                self.read_performance_log()
+    
+    def finish_account_timings(self):
+        """Stop collecting phase timings and return them serialized"""
+        timings = getattr(self._timing_state, "timings", None) or {}
+        self._timing_state.timings = None
+        return {phase: histogram.to_dict() for phase, histogram in timings.items()}
+    
+    def read_performance_log(self):
+        """Drain Chrome's performance log, returning no entries when the session has none"""
+        try:
+            return self.driver.get_log("performance")
+        except WebDriverException as e:
+            logger.debug(f"Performance log unavailable: {e}")
+            return []
+    
+    def collect_browser_trace(self, recorder):
+        """Add the browser's pending network events and page timing entries to a trace recorder"""
+        if not self.driver:
+            return
+        recorder.add_performance_log(self.read_performance_log())
+        try:
+            recorder.add_performance_entries(self.driver.execute_script(PERFORMANCE_ENTRIES_SCRIPT))
+        except WebDriverException as e:
+            logger.debug(f"Performance entries unavailable: {e}")
+    
+    def finish_account_trace(self):
+        """Stop tracing the current account and return its span timeline"""
+        recorder = getattr(self._timing_state, "trace", None)
+        self._timing_state.trace = None
+        return recorder.finish() if recorder else []
+    
+    def step_allowed(self, step, account_result):
+        """Return whether the circuit breaker lets this account run a step, noting the skip in its result if not"""
+        self._timing_state.last_failure = None
+        reason = self.circuit_breaker.allow(step) if self.circuit_breaker else None
+        if reason is None:
+            return True
+        account_result.setdefault("skipped_steps", []).append({"step": step, "reason": reason})
+        return False
+    
+    def record_step(self, step, ok, error=None):
+        """Log a step's outcome and report it to the circuit breaker, classifying silent failures by the last missing field"""
+        error = None if ok else error or getattr(self._timing_state, "last_failure", None) or f"{step} reported failure"
+        duration = getattr(self._timing_state, "pending_steps", {}).pop(step, None)
+        if duration is not None:
+            self.log_step_event(step, duration, "ok" if ok else "failed", error)
+        if self.circuit_breaker:
+            self.circuit_breaker.record(step, ok, error)
+    
+    def find_element_by_multiple_strategies(self, element_identifiers, timeout=None, field="element"):
+        """Race all identifier strategies in a single wait and return the first match"""
+        strategies = [
+            (By.NAME, "name"),
+            (By.ID, "id"),
+            (By.CLASS_NAME, "class"),
+            (By.CSS_SELECTOR, "css"),
+            (By.XPATH, "xpath"),
+            (By.LINK_TEXT, "link_text"),
+            (By.PARTIAL_LINK_TEXT, "partial_link_text")
+        ]
+        locators = [(key, element_identifiers[key]) for _, key in strategies if key in element_identifiers]
+        
+        url = self.driver.current_url
+        cached = self.locator_cache.get(url, field) if self.locator_cache and field != "element" else None
+        # Only default waits are shortened; callers passing a timeout, like the result wait, always get it in full
+        if timeout is None and self.locator_cache and field != "element" and self.locator_cache.recently_missing(url, field):
+            timeout = self.missing_field_timeout
+        if cached and (cached["strategy"], cached["selector"]) in locators:
+            locators.remove((cached["strategy"], cached["selector"]))
+            locators.insert(0, (cached["strategy"], cached["selector"]))
+        
+        by_key = {key: strategy for strategy, key in strategies}
+        
+        def first_present(driver):
+            # find_elements never raises for a miss, so each poll checks every strategy once
+            for key, selector in locators:
+                elements = driver.find_elements(by_key[key], selector)
+                if elements:
+                    return key, selector, elements[0]
+            return False
+        
+        try:
+            with self.time_phase(f"locate_{field}"):
+                key, selector, element = WebDriverWait(self.driver, timeout or self.element_timeout, poll_frequency=0.1).until(first_present)
+            logger.debug(f"Found element using {key}: {selector}")
+            if self.locator_cache and field != "element":
+                self.locator_cache.remember(url, field, key, selector)
+            return element
+        except TimeoutException:
+            logger.warning(f"Could not find element with identifiers: {element_identifiers}")
+            self._timing_state.last_failure = f"{field} not found on {urlparse(url).path or '/'}"
+            if self.locator_cache and field != "element":
+                self.locator_cache.invalidate(url, field)
+            return None
+    
+    def click_first_indicator(self, indicators, field, label):
+        """Click the first link or button whose text matches an indicator, trying the cached match first"""
+        candidates = []
+        for indicator in indicators:
+            candidates.append(("partial_link_text", indicator.replace("-", " ").title(), indicator, "link"))
+            candidates.append(("xpath", f"//button[contains(text(), '{indicator}')]", indicator, "button"))
+        
+        url = self.driver.current_url
+        cached = self.locator_cache.get(url, field) if self.locator_cache else None
+        if cached:
+            candidates.sort(key=lambda candidate: candidate[1] != cached["selector"])
+        
+        # find_elements returns an empty list on a miss, avoiding an exception per indicator
+        for strategy, selector, indicator, kind in candidates:
+            elements = self.driver.find_elements(By.PARTIAL_LINK_TEXT if kind == "link" else By.XPATH, selector)
+            if not elements:
+                continue
+            before = self.capture_page_state()
+            elements[0].click()
+            logger.info(f"Found and clicked {label} {kind}: {indicator}")
+            if self.locator_cache:
+                self.locator_cache.remember(url, field, strategy, selector)
+            self.wait_for_action_effect(before, elements[0])
+            return True
+        
+        if self.locator_cache:
+            self.locator_cache.invalidate(url, field)
+        return False
+    
+    def get_network_state(self):
+        """Return document readiness and fetch/XHR counters for the current page"""
+        try:
+            return self.driver.execute_script(NETWORK_STATE_SCRIPT)
+        except Exception as e:
+            logger.debug(f"Could not read network state: {e}")
+            return None
+    
+    def capture_page_state(self):
+        """Snapshot the URL, request counter and DOM mutation counter before triggering an action"""
+        state = self.get_network_state() or {}
+        return {
+            "url": self.driver.current_url,
+            "requests_started": state.get("started", 0),
+            "mutations": state.get("mutations", 0)
+        }
+    
+    def wait_for_page_ready(self, timeout=None):
+        """Wait until the document is loaded and no fetch/XHR has been in flight for network_idle_time"""
+        last_seen = {"resources": None, "since": time.monotonic()}
+        
+        def network_idle(driver):
+            state = self.get_network_state()
+            if not state or state["ready"] != "complete" or state["pending"] > 0:
+                last_seen["resources"] = None
+                return False
+            now = time.monotonic()
+            if state["resources"] != last_seen["resources"]:
+                last_seen["resources"] = state["resources"]
+                last_seen["since"] = now
+                return False
+            return now - last_seen["since"] >= self.network_idle_time
+        
+        try:
+            WebDriverWait(self.driver, timeout or self.navigation_timeout, poll_frequency=0.1).until(network_idle)
+            return True
+        except TimeoutException:
+            logger.warning("Timed out waiting for the page to become idle")
+            return False
+    
+    def wait_for_action_effect(self, before, trigger_element=None, timeout=None):
+        """Wait for a click/submit to take effect (URL change, trigger detached, a request sent or the DOM changed), then for the page to settle"""
+        def action_took_effect(driver):
+            if driver.current_url != before["url"]:
+                return True
+            if trigger_element is not None:
+                try:
+                    trigger_element.is_enabled()
+                except StaleElementReferenceException:
+                    return True
+            state = self.get_network_state()
+            return bool(state) and (state["started"] > before["requests_started"] or state["mutations"] > before["mutations"])
+        
+        try:
+            WebDriverWait(self.driver, timeout or self.navigation_timeout, poll_frequency=0.1).until(action_took_effect)
+        except TimeoutException:
+            logger.warning("Action had no observable effect on the page")
+            return False
+        return self.wait_for_page_ready(timeout)
+    
+    def analyze_page_structure(self):
+        """Analyze the current page structure and find relevant elements"""
+        logger.info("Analyzing page structure...")
+        
+        if not self.driver:
+            logger.error("WebDriver not initialized")
+            return None
+        
+        previous = self._last_page_structure if self.reuse_page_structure else None
+        scraped = self.driver.execute_script(PAGE_STRUCTURE_SCRIPT, previous["dom_hash"] if previous else None)
+        
+        if scraped["unchanged"]:
+            # Same DOM as the last capture on this session, so only the timestamp needs refreshing
+            logger.info("Page DOM unchanged since last capture, reusing page structure")
+            return dict(previous, page_info=dict(previous["page_info"], timestamp=datetime.now().isoformat()))
+        
+        # Get page title and URL
+        page_info = {
+            "title": scraped["title"],
+            "url": scraped["url"],
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        logger.info(f"Found {scraped['forms_count']} forms on the page")
+        
+        structure = {
+            "page_info": page_info,
+            "forms_count": scraped["forms_count"],
+            "inputs": scraped["inputs"],
+            "buttons": scraped["buttons"],
+            "links": scraped["links"],
+            "dom_hash": scraped["dom_hash"]
+        }
+        self._last_page_structure = structure
+        
+        logger.info(f"Page structure analysis complete")
+        return structure
+    
+    def attempt_account_creation(self, account):
+        """Attempt to create an account with various strategies"""
+        logger.info(f"Attempting to create account: {account['username']}")
+        
+        if not self.driver:
+            logger.error("WebDriver not initialized")
+            return False
+        
+        # Common registration page indicators
+        registration_indicators = [
+            "register", "signup", "sign-up", "create-account", "join",
+            "registration", "new-user", "account-creation"
+        ]
+        
+        # Try to find registration/signup elements
+        self.click_first_indicator(registration_indicators, "registration_link", "registration")
+        
+        # Try to fill registration form
+        form_filled = False
+        
+        # Common username field identifiers
+        username_fields = {
+            "name": "username",
+            "id": "username",
+            "css": "input[name='username']",
+            "xpath": "//input[@placeholder='Username' or @placeholder='User Name']"
+        }
+        
+        username_field = self.find_element_by_multiple_strategies(username_fields, field="username")
+        if username_field:
+            username_field.clear()
+            username_field.send_keys(account["username"])
+            logger.info(f"Filled username field: {account['username']}")
+            form_filled = True
+        
+        # Common email field identifiers
+        email_fields = {
+            "name": "email",
+            "id": "email",
+            "css": "input[type='email']",
+            "xpath": "//input[@placeholder='Email' or @placeholder='Email Address']"
+        }
+        
+        email_field = self.find_element_by_multiple_strategies(email_fields, field="email")
+        if email_field:
+            email_field.clear()
+            email_field.send_keys(account["email"])
+            logger.info(f"Filled email field: {account['email']}")
+            form_filled = True
+        
+        # Common password field identifiers
+        password_fields = {
+            "name": "password",
+            "id": "password",
+            "css": "input[type='password']",
+            "xpath": "//input[@placeholder='Password']"
+        }
+        
+        password_field = self.find_element_by_multiple_strategies(password_fields, field="password")
+        if password_field:
+            password_field.clear()
+            password_field.send_keys(account["password"])
+            logger.info(f"Filled password field")
+            form_filled = True
+        
+        # Try to submit the form
+        if form_filled:
+            with self.time_phase("registration_submit"):
+                try:
+                    submit_button = self.driver.find_element(By.XPATH, "//button[@type='submit' or contains(text(), 'Submit') or contains(text(), 'Register') or contains(text(), 'Sign Up')]")
+                    before = self.capture_page_state()
+                    submit_button.click()
+                    logger.info("Submitted registration form")
+                    self.wait_for_action_effect(before, submit_button)
+                    return True
+                except NoSuchElementException:
+                    try:
+                        # Try pressing Enter
+                        before = self.capture_page_state()
+                        password_field.send_keys(Keys.RETURN)
+                        logger.info("Submitted form using Enter key")
+                        self.wait_for_action_effect(before)
+                        return True
+                    except Exception as e:
+                        logger.warning(f"Could not submit form: {e}")
+        
+        return False
+    
+    def attempt_login(self, account):
+        """Attempt to login with the account"""
+        logger.info(f"Attempting to login: {account['username']}")
+        
+        if not self.driver:
+            logger.error("WebDriver not initialized")
+            return False
+        
+        # Common login page indicators
+        login_indicators = ["login", "sign-in", "signin", "log-in", "enter"]
+        
+        # Try to find login elements
+        self.click_first_indicator(login_indicators, "login_link", "login")
+        
+        # Try to fill login form
+        form_filled = False
+        
+        # Username/email field
+        username_fields = {
+            "name": "username",
+            "id": "username",
+            "css": "input[name='email']",
+            "xpath": "//input[@placeholder='Username' or @placeholder='Email']"
+        }
+        
+        username_field = self.find_element_by_multiple_strategies(username_fields, field="username")
+        if username_field:
+            username_field.clear()
+            username_field.send_keys(account["username"])
+            logger.info(f"Filled login username field")
+            form_filled = True
+        
+        # Password field
+        password_fields = {
+            "name": "password",
+            "id": "password",
+            "css": "input[type='password']",
+            "xpath": "//input[@placeholder='Password']"
+        }
+        
+        password_field = self.find_element_by_multiple_strategies(password_fields, field="password")
+        if password_field:
+            password_field.clear()
+            password_field.send_keys(account["password"])
+            logger.info(f"Filled login password field")
+            form_filled = True
+        
+        # Submit login form
+        if form_filled:
+            with self.time_phase("login_submit"):
+                try:
+                    submit_button = self.driver.find_element(By.XPATH, "//button[@type='submit' or contains(text(), 'Login') or contains(text(), 'Sign In')]")
+                    before = self.capture_page_state()
+                    submit_button.click()
+                    logger.info("Submitted login form")
+                    self.wait_for_action_effect(before, submit_button)
+                    return True
+                except NoSuchElementException:
+                    try:
+                        before = self.capture_page_state()
+                        password_field.send_keys(Keys.RETURN)
+                        logger.info("Submitted login form using Enter key")
+                        self.wait_for_action_effect(before)
+                        return True
+                    except Exception as e:
+                        logger.warning(f"Could not submit login form: {e}")
+        
+        return False
+    
+    def attempt_medical_translation(self, term):
+        """Attempt to translate a medical term"""
+        logger.info(f"Attempting to translate medical term: {term}")
+        
+        if not self.driver:
+            logger.error("WebDriver not initialized")
+            return None
+        
+        # Common translation interface elements
+        translation_fields = {
+            "name": "search",
+            "id": "search",
+            "css": "input[placeholder*='search' i]",
+            "xpath": "//input[@placeholder='Search' or @placeholder='Enter term' or @placeholder='Medical term']"
+        }
+        
+        search_field = self.find_element_by_multiple_strategies(translation_fields, field="search")
+        if search_field:
+            search_field.clear()
+            search_field.send_keys(term)
+            logger.info(f"Entered medical term: {term}")
+            
+            # Try to submit search
+            before = self.capture_page_state()
+            try:
+                search_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Search') or contains(text(), 'Translate') or contains(text(), 'Submit')]")
+                search_button.click()
+                logger.info("Clicked search button")
+            except NoSuchElementException:
+                try:
+                    search_field.send_keys(Keys.RETURN)
+                    logger.info("Submitted search using Enter key")
+                except Exception as e:
+                    logger.warning(f"Could not submit search: {e}")
+            
+            # The translate request goes through the AI model, so allow it the longer result timeout
+            self.wait_for_action_effect(before, timeout=self.result_timeout)
+            
+            # Wait for a translation result node to appear instead of sleeping
+            result_identifiers = {
+                "xpath": "//div[contains(@class, 'result') or contains(@class, 'translation') or contains(@class, 'definition')]"
+            }
+            try:
+                result = self.find_element_by_multiple_strategies(result_identifiers, timeout=self.result_timeout, field="translation_result")
+                if result:
+                    translation_result = result.text
+                    logger.info(f"Found translation result: {translation_result[:100]}...")
+                    return translation_result
+                else:
+                    logger.warning("No translation results found")
+                    return None
+            except Exception as e:
+                logger.warning(f"Error finding translation results: {e}")
+                return None
+        
+        logger.warning("Could not find translation interface")
+        return None
+    
+    def run_account_test(self, account):
+        """Run complete test for a single account"""
+        logger.info(f"Starting test for account: {account['username']}")
+        
+        account_result = {
+            "account": account,
+            "registration_success": False,
+            "login_success": False,
+            "translations": [],
+            "errors": [],
+            "page_structure": None
+        }
+        
+        if not self.driver:
+            logger.error("WebDriver not initialized")
+            account_result["errors"].append("WebDriver not initialized")
+            return account_result
+        
+        self.start_account_timings(account)
+        try:
+            # Navigate to website; with the site down there is nothing else to try
+            if not self.step_allowed("page_load", account_result):
+                return account_result
+            try:
+                with self.time_phase("page_load"):
+                    self.driver.get(self.base_url)
+                    self.wait_for_page_ready()
+            except Exception as e:
+                self.record_step("page_load", False, str(e))
+                raise
+            self.record_step("page_load", True)
+            
+            # Analyze page structure
+            with self.time_phase("analyze_page_structure"):
+                account_result["page_structure"] = self.analyze_page_structure()
+            
+            # Try to create account
+            if self.step_allowed("registration", account_result):
+                try:
+                    with self.time_phase("registration"):
+                        account_result["registration_success"] = self.attempt_account_creation(account)
+                    self.record_step("registration", account_result["registration_success"])
+                except Exception as e:
+                    error_msg = f"Account creation failed: {e}"
+                    logger.error(error_msg)
+                    account_result["errors"].append(error_msg)
+                    self.record_step("registration", False, str(e))
+            
+            # Try to login (whether registration succeeded or not)
+            if self.step_allowed("login", account_result):
+                try:
+                    with self.time_phase("login"):
+                        account_result["login_success"] = self.attempt_login(account)
+                    self.record_step("login", account_result["login_success"])
+                except Exception as e:
+                    error_msg = f"Login failed: {e}"
+                    logger.error(error_msg)
+                    account_result["errors"].append(error_msg)
+                    self.record_step("login", False, str(e))
+            
+            # If logged in successfully, try medical translations
+            if account_result["login_success"]:
+                # Select this account's medical terms; the browser flow always uses the page's default model
+                selected_terms = [term for term, _ in self.select_terms()]
+                
+                for term in selected_terms:
+                    if not self.step_allowed("translation", account_result):
+                        break
+                    try:
+                        with self.time_phase("translation"):
+                            translation = self.attempt_medical_translation(term)
+                        account_result["translations"].append({
+                            "term": term,
+                            "translation": translation,
+                            "success": translation is not None
+                        })
+                        self.record_step("translation", translation is not None)
+                    except Exception as e:
+                        error_msg = f"Translation failed for {term}: {e}"
+                        logger.error(error_msg)
+                        account_result["errors"].append(error_msg)
+                        account_result["translations"].append({
+                            "term": term,
+                            "translation": None,
+                            "success": False
+                        })
+                        self.record_step("translation", False, str(e))
+            
+        except Exception as e:
+            error_msg = f"General error for account {account['username']}: {e}"
+            logger.error(error_msg)
+            account_result["errors"].append(error_msg)
+        finally:
+            account_result["timings"] = self.finish_account_timings()
+            if self.trace:
+                account_result["trace"] = self.finish_account_trace()
+        
+        return account_result
+    
+    def select_terms(self):
+        """Return this account's (term, model) pairs: the next slice of the corpus plan, or a random sample"""
+        if self.term_corpus:
+            return self.term_corpus.take(self.terms_per_account)
+        count = min(self.terms_per_account, len(self.medical_terms))
+        return [(term, None) for term in random.sample(self.medical_terms, count)]
+    
+    def record_result(self, result):
+        """Stream a finished account result when a results writer is set, otherwise keep it in memory"""
+        if self.account_factory:
+            self.account_factory.record_result(result)
+        if self.results_writer:
+            self.results_writer.write(result)
+        else:
+            self.results.append(result)
+    
+    def accounts_to_run(self):
+        """Return the test accounts that have no result yet in a resumed results file"""
+        if not self.results_writer:
+            return self.test_accounts
+        return [account for account in self.test_accounts if account['username'] not in self.results_writer.completed]
+    
+    def run_debug_tests(self):
+        """Run debugging tests for all accounts"""
+        logger.info("Starting Medical Terms Website Debug Tests")
+        
+        # Check website accessibility
+        if self.preflight and not self.check_website_accessibility():
+            logger.error("Website is not accessible. Exiting.")
+            return
+        
+        accounts = self.accounts_to_run()
+        
+        try:
+            for result in self.run_accounts_on_pool(accounts):
+                self.record_result(result)
+        finally:
+            if self.locator_cache:
+                self.locator_cache.save()
+    
+    def run_accounts_on_pool(self, accounts):
+        """Run account tests on a pool of browser sessions, yielding results in account order"""
+        pool_size = min(self.workers, len(accounts))
+        if not pool_size:
+            return
+        
+        # A caller-provided pool stays warm after the run; otherwise one is started just for these accounts
+        driver_pool = self.driver_pool
+        if driver_pool is None:
+            driver_pool = DriverPool(self.create_driver, pool_size, max_uses=self.max_driver_uses).start()
+        local = threading.local()
+        
+        def run_on_worker(indexed_account):
+            i, account = indexed_account
+            worker = getattr(local, "worker", None)
+            if worker is None:
+                worker = local.worker = copy.copy(self)
+            driver = driver_pool.acquire()
+            worker.driver = driver
+            worker.wait = WebDriverWait(driver, 10)
+            healthy = False
+            try:
+                logger.info(f"Testing account {i}/{len(accounts)}: {account['username']}")
+                result = worker.run_account_test(account)
+                healthy = self.is_driver_alive(driver)
+                if healthy and self.recycle_sessions:
+                    worker.reset_browser_state()
+                return result
+            finally:
+                worker.driver = None
+                worker.wait = None
+                driver_pool.release(driver, healthy)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=pool_size) as executor:
+                # map() yields results in submission order regardless of completion order
+                yield from executor.map(run_on_worker, enumerate(accounts, 1))
+        finally:
+            if driver_pool is not self.driver_pool:
+                driver_pool.close()
+    
+    def generate_report(self):
+        """Generate comprehensive test report"""
+        logger.info("Generating test report...")
+        
+        if self.results_writer:
+            # Streamed runs already have their details on disk; aggregates were kept while writing
+            self.results_writer.close()
+            stats = self.results_writer.summary
+            results = self.results_writer.iter_results
+            details_path = self.results_writer.path
+        else:
+            # Save detailed results to JSON
+            with open('medical_terms_debug_results.json', 'w') as f:
+                json.dump(self.results, f, indent=2, default=str)
+            stats = ResultsSummary.from_results(self.results)
+            results = lambda: self.results
+            details_path = 'medical_terms_debug_results.json'
+        
+        # Generate summary report
+        total_accounts = stats.total_accounts
+        successful_registrations = stats.successful_registrations
+        successful_logins = stats.successful_logins
+        total_translations = stats.total_translations
+        successful_translations = stats.successful_translations
+        phase_timings = stats.phase_timings
+        self.export_latency(phase_timings, results())
+        if self.trace:
+            self.export_trace(results())
+        
+        summary_file = open('medical_terms_debug_summary.txt', 'w')
+        
+        def emit(text):
+            # Written and printed section by section so the report never holds every account in memory
+            summary_file.write(text)
+            print(text, end='')
+        
+        with summary_file:
+            summary = f"""
+Medical Terms Website Debug Report
+=================================
+Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Website: {self.base_url}
+
+SUMMARY STATISTICS:
+- Total Accounts Tested: {total_accounts}
+- Successful Registrations: {format_share(successful_registrations, total_accounts, "no accounts")}
+- Successful Logins: {format_share(successful_logins, total_accounts, "no accounts")}
+- Total Translation Attempts: {total_translations}
+- Successful Translations: {format_share(successful_translations, total_translations, "no translations")}
+
+LATENCY BY PHASE:
+"""
+            for phase in sorted(phase_timings):
+                summary += f"- {phase}: {format_latency(phase_timings[phase].summary())}\n"
+            
+            if stats.skipped_steps:
+                summary += "\nSTEPS SKIPPED BY CIRCUIT BREAKER:\n"
+                for (step, reason), count in sorted(stats.skipped_steps.items()):
+                    summary += f"- {step}: {count} accounts ({reason})\n"
+            
+            summary += """
+DETAILED RESULTS:
+"""
+            emit(summary)
+            
+            for i, result in enumerate(results(), 1):
+                account = result['account']
+                translations_success = sum(1 for t in result['translations'] if t['success'])
+                translations_total = len(result['translations'])
+                
+                summary = f"""
+Account {i}: {account['username']}
+- Registration: {'✓' if result['registration_success'] else '✗'}
+- Login: {'✓' if result['login_success'] else '✗'}
+- Translations: {translations_success}/{translations_total}
+- Errors: {len(result['errors'])}
+"""
+                
+                if result['errors']:
+                    summary += f"  Errors: {'; '.join(result['errors'])}\n"
+                if result.get('skipped_steps'):
+                    summary += f"  Skipped: {', '.join(skip['step'] for skip in result['skipped_steps'])}\n"
+                
+                for phase, data in sorted(result.get('timings', {}).items()):
+                    summary += f"  {phase}: {format_latency(LatencyHistogram.from_dict(data).summary())}\n"
+                emit(summary)
+            
+            emit(f"""
+RECOMMENDATIONS:
+1. Check website accessibility and structure
+2. Review form field identifiers and validation
+3. Test translation functionality manually
+4. Verify user authentication flow
+5. Check for any rate limiting or bot detection
+
+For detailed technical information, see: {details_path}
+For latency percentiles and histograms, see: medical_terms_debug_latency.json
+For execution logs, see: {current_log_file() or 'stderr only (--log-file was empty)'}
+""")
+        
+        logger.info("Report generated successfully")
+    
+    def export_latency(self, phase_timings, results, path='medical_terms_debug_latency.json'):
+        """Write per-phase and per-account latency percentiles plus mergeable histograms as JSON"""
+        header = {
+            "generated": datetime.now().isoformat(),
+            "base_url": self.base_url,
+            "phases": {
+                phase: {"summary": histogram.summary(), "histogram": histogram.to_dict()}
+                for phase, histogram in phase_timings.items()
+            }
+        }
+        with open(path, 'w') as f:
+            # Per-account entries are written one at a time so streamed runs stay in bounded memory
+            f.write(json.dumps(header)[:-1] + ', "accounts": {')
+            for i, result in enumerate(results):
+                timings = {
+                    phase: LatencyHistogram.from_dict(data).summary()
+                    for phase, data in result.get("timings", {}).items()
+                }
+                f.write(f"{', ' if i else ''}{json.dumps(result['account']['username'])}: {json.dumps(timings)}")
+            f.write("}}\n")
+
+    def export_trace(self, results, path='medical_terms_debug_trace.json'):
+        """Write every account's span timeline as one Chrome trace event file, one thread per account"""
+        with open(path, 'w') as f:
+            f.write('{"displayTimeUnit": "ms", "traceEvents": [')
+            first = True
+            for tid, result in enumerate(results, 1):
+                for event in TraceRecorder.to_trace_events(result.get("trace", []), 1, tid, result['account']['username']):
+                    f.write(("" if first else ",\n") + json.dumps(event))
+                    first = False
+            f.write("]}\n")
+        logger.info(f"Trace written to {path}; open it in chrome://tracing or Perfetto")
+
+class MedicalTermsAPIDebugger(MedicalTermsDebugger):
+    """Runs the register -> login -> translate scenario directly against the API routes, without a browser"""
+    
+    def __init__(self, num_accounts=10, workers=1, model=None, base_url=None, account_factory=None, trace=False):
+        super().__init__(num_accounts=num_accounts, workers=workers, locator_cache_path=None, base_url=base_url,
+                         account_factory=account_factory, trace=trace)
+        self.model = model
+        self.request_timeout = 30
+        self._local = threading.local()
+        self.translation_cache = None
+        self.refresh_translations = False
+        self.quota_scheduler = None
+    
+    def get_session(self):
+        """Return this thread's keep-alive HTTP client"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = HTTPClient(self.base_url, timeout=self.request_timeout)
+            self._local.session = session
+        return session
+    
+    def post_json(self, path, payload):
+        """POST a JSON payload and return the response with its decoded body"""
+        response = self.get_session().request("POST", path, payload)
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        return response, body
+    
+    def api_authenticate(self, action, account):
+        """Call /api/auth with the given action and return (user_id, error)"""
+        response, body = self.post_json("/api/auth", {
+            "action": action,
+            "username": account["username"],
+            "password": account["password"]
+        })
+        if response.ok and body.get("data"):
+            return body["data"].get("userId"), None
+        return None, f"{action} returned {response.status_code}: {body.get('error', response.reason)}"
+    
+    def api_history(self, user_id):
+        """Call /api/history for a user and return (entries, error)"""
+        response = self.get_session().get("/api/history", params={"userId": user_id})
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        if response.ok and body.get("success"):
+            return body.get("data", []), None
+        return None, f"history returned {response.status_code}: {body.get('error', response.reason)}"
+    
+    def api_translate(self, user_id, term, model=None):
+        """Call /api/translate for a term and return (explanation, error), reusing cached responses when allowed"""
+        model = model or self.model
+        if self.translation_cache and not self.refresh_translations:
+            cached = self.translation_cache.get(term, model)
+            if cached is not None:
+                return cached, None
+        
+        payload = {"userId": user_id, "medicalText": term}
+        if model:
+            payload["model"] = model
+        response, body = self.post_json("/api/translate", payload)
+        if self.quota_scheduler:
+            self.quota_scheduler.release(user_id, response.status_code, body, acquired=False)
+        if response.ok and body.get("success"):
+            explanation = body["data"].get("explanation")
+            # Partial responses come from the fallback model, so they must not stand in for the requested one
+            if self.translation_cache and explanation is not None and not body["data"].get("partial"):
+                self.translation_cache.put(term, model, explanation)
+            return explanation, None
+        return None, f"translate returned {response.status_code}: {body.get('error', response.reason)}"
+    
+    def run_account_test(self, account):
+        """Run the register -> login -> translate scenario for a single account over HTTP"""
+        logger.info(f"Starting API test for account: {account['username']}")
+        
+        account_result = {
+            "account": account,
+            "registration_success": False,
+            "login_success": False,
+            "translations": [],
+            "errors": [],
+            "page_structure": None
+        }
+        
+        self.start_account_timings(account)
+        try:
+            if self.step_allowed("registration", account_result):
+                try:
+                    with self.time_phase("registration"):
+                        user_id, error = self.api_authenticate("register", account)
+                except HTTP_ERRORS as e:
+                    user_id, error = None, str(e)
+                account_result["registration_success"] = user_id is not None
+                if error:
+                    account_result["errors"].append(f"Account creation failed: {error}")
+                self.record_step("registration", user_id is not None, error)
+            
+            # Try to login (whether registration succeeded or not)
+            user_id = None
+            if self.step_allowed("login", account_result):
+                try:
+                    with self.time_phase("login"):
+                        user_id, error = self.api_authenticate("login", account)
+                except HTTP_ERRORS as e:
+                    user_id, error = None, str(e)
+                account_result["login_success"] = user_id is not None
+                account_result["user_id"] = user_id
+                if error:
+                    account_result["errors"].append(f"Login failed: {error}")
+                self.record_step("login", user_id is not None, error)
+            
+            if account_result["login_success"]:
+                for term, model in self.select_terms():
+                    if self.quota_scheduler and not self.quota_scheduler.has_quota(user_id):
+                        # Stop before the app starts answering 403; skipped terms are counted instead of sent
+                        account_result["quota_skipped"] = account_result.get("quota_skipped", 0) + 1
+                        continue
+                    if not self.step_allowed("translation", account_result):
+                        break
+                    try:
+                        with self.time_phase("translation"):
+                            translation, error = self.api_translate(user_id, term, model)
+                    except HTTP_ERRORS as e:
+                        translation, error = None, str(e)
+                    if error:
+                        account_result["errors"].append(f"Translation failed for {term}: {error}")
+                    account_result["translations"].append({
+                        "term": term,
+                        "model": model or self.model,
+                        "translation": translation,
+                        "success": translation is not None
+                    })
+                    self.record_step("translation", translation is not None, error)
+        
+        except Exception as e:
+            error_msg = f"General error for account {account['username']}: {e}"
+            logger.error(error_msg)
+            account_result["errors"].append(error_msg)
+        finally:
+            account_result["timings"] = self.finish_account_timings()
+            if self.trace:
+                account_result["trace"] = self.finish_account_trace()
+        
+        return account_result
+    
+    def compare_translations_to_golden(self, golden_path, path='medical_terms_translation_diff.json'):
+        """Diff cached translations against a golden snapshot and write the differences as JSON"""
+        diff = self.translation_cache.diff(golden_path)
+        with open(path, 'w') as f:
+            json.dump(diff, f, indent=2)
+        logger.info(
+            f"Golden comparison: {diff['unchanged']} unchanged, {len(diff['changed'])} changed, "
+            f"{len(diff['missing'])} missing, {diff['new']} new (see {path})"
+        )
+        return diff
+    
+    def run_debug_tests(self):
+        """Run the API scenario for all accounts, concurrently when workers > 1"""
+        logger.info("Starting Medical Terms API Debug Tests")
+        
+        if self.preflight and not self.check_website_accessibility():
+            logger.error("Website is not accessible. Exiting.")
+            return
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for result in executor.map(self.run_account_test, self.accounts_to_run()):
+                self.record_result(result)
+
+class TranslateLoadGenerator:
+    """Open-model asyncio load generator for /api/auth and /api/translate over pooled keep-alive connections"""
+    
+    def __init__(self, debugger, concurrency=50, arrival_rate=10.0, duration=60, model=None, quota_scheduler=None):
+        import_aiohttp()
+        self.debugger = debugger
+        self.quota_scheduler = quota_scheduler or QuotaScheduler()
+        self.base_url = debugger.base_url
+        self.concurrency = max(1, concurrency)
+        self.arrival_rate = arrival_rate
+        self.duration = duration
+        self.model = model
+        self.request_timeout = 60
+        self.status_counts = {}
+        self.quota_usage = {}
+        self.latency = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+    
+    async def post_json(self, session, path, payload):
+        """POST a JSON payload and return (status, body)"""
+        async with session.post(f"{self.base_url}{path}", json=payload) as response:
+            try:
+                body = await response.json(content_type=None)
+            except ValueError:
+                body = {}
+            return response.status, body or {}
+    
+    async def prepare_users(self, session):
+        """Register and log in every test account, returning the user ids that can translate; warm accounts are reused as is"""
+        limiter = asyncio.Semaphore(self.concurrency)
+        account_factory = self.debugger.account_factory
+        
+        async def authenticate(account):
+            if account.get("user_id"):
+                self.quota_scheduler.add(account["user_id"], remaining=account.get("remaining"))
+                return account["user_id"]
+            async with limiter:
+                credentials = {"username": account["username"], "password": account["password"]}
+                try:
+                    await self.post_json(session, "/api/auth", {"action": "register", **credentials})
+                    status, body = await self.post_json(session, "/api/auth", {"action": "login", **credentials})
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    logger.warning(f"Load test login failed for {account['username']}: {e}")
+                    return None
+                if status != 200:
+                    logger.warning(f"Load test login failed for {account['username']}: {status} {body.get('error')}")
+                    return None
+                user_id = body.get("data", {}).get("userId")
+                if user_id is None:
+                    # A setup that yields no user id must not put a phantom account into the scheduler
+                    logger.warning(f"Load test login for {account['username']} returned no user id")
+                    return None
+                self.quota_scheduler.add(user_id)
+                if account_factory:
+                    account_factory.record_result({"account": account, "login_success": True, "user_id": user_id})
+                return user_id
+        
+        user_ids = await asyncio.gather(*(authenticate(account) for account in self.debugger.test_accounts))
+        return [user_id for user_id in user_ids if user_id is not None]
+    
+    async def translate(self, session, limiter, user_id, term, scheduled_at):
+        """Issue one translation and record latency measured from its scheduled arrival time"""
+        loop = asyncio.get_running_loop()
+        async with limiter:
+            started_at = loop.time()
+            payload = {"userId": user_id, "medicalText": term}
+            if self.model:
+                payload["model"] = self.model
+            body = {}
+            try:
+                status, body = await self.post_json(session, "/api/translate", payload)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = type(e).__name__
+            finished_at = loop.time()
+        self.quota_scheduler.release(user_id, status, body)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if status == 200:
+            self.quota_usage[user_id] = self.quota_usage.get(user_id, 0) + 1
+        # Latency includes time queued behind the concurrency limit so slow responses can't hide arrivals
+        self.latency.record(finished_at - scheduled_at)
+        self.service_time.record(finished_at - started_at)
+    
+    async def run_async(self):
+        """Generate Poisson arrivals at arrival_rate for duration seconds"""
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=30)
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            user_ids = await self.prepare_users(session)
+            if not user_ids:
+                raise RuntimeError("No test account could log in; cannot generate translate load")
+            logger.info(f"Load test starting with {len(user_ids)} accounts, {self.arrival_rate}/s for {self.duration}s")
+            
+            loop = asyncio.get_running_loop()
+            limiter = asyncio.Semaphore(self.concurrency)
+            tasks = []
+            started_at = loop.time()
+            next_arrival = started_at
+            while True:
+                next_arrival += random.expovariate(self.arrival_rate)
+                if next_arrival - started_at >= self.duration:
+                    break
+                await asyncio.sleep(max(0.0, next_arrival - loop.time()))
+                user_id = self.quota_scheduler.acquire()
+                if user_id is None:
+                    # Every account is out of quota; count the arrival rather than send a request bound to get a 403
+                    self.status_counts["quota_exhausted"] = self.status_counts.get("quota_exhausted", 0) + 1
+                    continue
+                term = random.choice(self.debugger.medical_terms)
+                tasks.append(asyncio.create_task(
+                    self.translate(session, limiter, user_id, term, next_arrival)
+                ))
+            await asyncio.gather(*tasks)
+            return loop.time() - started_at
+    
+    def run(self):
+        """Run the load test and return a summary of throughput, status codes and latency"""
+        elapsed = asyncio.run(self.run_async())
+        if self.debugger.account_factory:
+            self.debugger.account_factory.add_quota(self.quota_usage)
+        succeeded = self.status_counts.get(200, 0)
+        summary = {
+            "arrival_rate": self.arrival_rate,
+            "concurrency": self.concurrency,
+            "duration": elapsed,
+            "requests": self.latency.count,
+            "succeeded": succeeded,
+            "throughput": succeeded / elapsed if elapsed else 0.0,
+            "status_counts": {str(status): count for status, count in self.status_counts.items()},
+            "quota_tiers": self.quota_scheduler.tier_report(elapsed),
+            "accounts_exhausted": self.quota_scheduler.exhausted(),
+            "latency": self.latency.summary(),
+            "service_time": self.service_time.summary()
+        }
+        logger.info(f"Load test summary: {json.dumps(summary)}")
+        return summary
+
+class BenchmarkSuite:
+    """Named API workloads run repeatedly after a warmup, stored in a history file and compared against a baseline"""
+    
+    WORKLOADS = ["cold_login", "warm_translate", "history_fetch", "mixed"]
+    MIXED_WEIGHTS = {"cold_login": 1, "warm_translate": 3, "history_fetch": 2}
+    # Connection failures, plus the RuntimeError raised when a benchmark account cannot be set up
+    OPERATION_ERRORS = HTTP_ERRORS + (RuntimeError,)
+    
+    def __init__(self, debugger, history_path='medical_terms_benchmark_history.jsonl', warmup=3,
+                 iterations=20, repetitions=5, threshold=0.10, label=None, account_factory=None, target=None):
+        self.debugger = debugger
+        # Runs are only compared against earlier runs of the same target
+        self.target = target or debugger.base_url
+        self.history_path = history_path
+        self.warmup = warmup
+        self.iterations = iterations
+        self.repetitions = repetitions
+        self.threshold = threshold
+        self.label = label
+        self.account_factory = account_factory
+        self.run_tag = f"bench{int(time.time())}{os.getpid()}"
+        self.account_numbers = itertools.count(1)
+        self.quota_scheduler = QuotaScheduler()
+        self.history_users = []
+    
+    def new_account(self):
+        """Return credentials that have never been registered"""
+        if self.account_factory:
+            return self.account_factory.issue_one()
+        n = next(self.account_numbers)
+        return {"username": f"{self.run_tag}_{n}", "password": f"BenchPass{n}!"}
+    
+    def login_new_account(self):
+        """Register and log in a fresh account, returning its user id"""
+        account = self.new_account()
+        self.debugger.api_authenticate("register", account)
+        user_id, error = self.debugger.api_authenticate("login", account)
+        if user_id is None:
+            raise RuntimeError(f"Benchmark account setup failed: {error}")
+        return user_id
+    
+    def op_cold_login(self):
+        """Time registering and logging in a brand new account"""
+        account = self.new_account()
+        started = time.perf_counter()
+        self.debugger.api_authenticate("register", account)
+        user_id, _ = self.debugger.api_authenticate("login", account)
+        return time.perf_counter() - started, user_id is not None
+    
+    def op_warm_translate(self):
+        """Time one translation from an already logged-in account with quota left"""
+        user_id = self.quota_scheduler.acquire()
+        if user_id is None:
+            # Account setup is outside the timed region; only the translate call is measured
+            self.quota_scheduler.add(self.login_new_account())
+            user_id = self.quota_scheduler.acquire()
+        payload = {"userId": user_id, "medicalText": random.choice(self.debugger.medical_terms)}
+        if self.debugger.model:
+            payload["model"] = self.debugger.model
+        started = time.perf_counter()
+        response, body = self.debugger.post_json("/api/translate", payload)
+        elapsed = time.perf_counter() - started
+        self.quota_scheduler.release(user_id, response.status_code, body)
+        if response.ok and body.get("success"):
+            self.history_users.append(user_id)
+        return elapsed, response.ok and body.get("success", False)
+    
+    def op_history_fetch(self):
+        """Time fetching the history of an account that has translations"""
+        if not self.history_users:
+            self.op_warm_translate()
+        user_id = random.choice(self.history_users) if self.history_users else self.login_new_account()
+        started = time.perf_counter()
+        entries, _ = self.debugger.api_history(user_id)
+        return time.perf_counter() - started, entries is not None
+    
+    def op_mixed(self):
+        """Time one operation drawn from MIXED_WEIGHTS"""
+        name = random.choices(list(self.MIXED_WEIGHTS), weights=list(self.MIXED_WEIGHTS.values()))[0]
+        return getattr(self, f"op_{name}")()
+    
+    def run_workload(self, name):
+        """Run a workload's warmup and timed repetitions and return its history record"""
+        operation = getattr(self, f"op_{name}")
+        for _ in range(self.warmup):
+            try:
+                operation()
+            except self.OPERATION_ERRORS as e:
+                logger.warning(f"Benchmark {name} warmup failed: {e}")
+        
+        latency = LatencyHistogram()
+        p95_samples, throughput_samples, errors, total_succeeded = [], [], 0, 0
+        for _ in range(self.repetitions):
+            repetition = LatencyHistogram()
+            succeeded, busy = 0, 0.0
+            for _ in range(self.iterations):
+                try:
+                    elapsed, ok = operation()
+                except self.OPERATION_ERRORS as e:
+                    logger.warning(f"Benchmark {name} request failed: {e}")
+                    errors += 1
+                    continue
+                repetition.record(elapsed)
+                busy += elapsed
+                succeeded += ok
+                errors += not ok
+            total_succeeded += succeeded
+            if not repetition.count:
+                # Nothing was timed, so this repetition has no p95 or throughput to compare
+                continue
+            latency.merge(repetition)
+            # Throughput counts only timed work, so account setup between operations doesn't dilute it
+            p95_samples.append(repetition.value_at_percentile(95))
+            throughput_samples.append(succeeded / busy if busy else 0.0)
+        
+        summary = latency.summary()
+        summary["p95"] = latency.value_at_percentile(95)
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "label": self.label,
+            "target": self.target,
+            "workload": name,
+            "warmup": self.warmup,
+            "iterations": self.iterations,
+            "repetitions": self.repetitions,
+            "errors": errors,
+            # A workload where no operation succeeded is kept in the history but never used as a baseline
+            "failed": not total_succeeded,
+            "latency": summary,
+            "p95_samples": p95_samples,
+            "throughput_samples": throughput_samples,
+            "histogram": latency.to_dict()
+        }
+    
+    def load_history(self):
+        """Return every stored benchmark record, oldest first"""
+        if not os.path.exists(self.history_path):
+            return []
+        return list(read_results(self.history_path))
+    
+    def find_baseline(self, history, record, baseline=None):
+        """Return the latest earlier record for the same workload and site, optionally restricted to a label"""
+        for previous in reversed(history):
+            if previous["workload"] != record["workload"] or previous["target"] != record["target"] or previous.get("failed"):
+                continue
+            if baseline is None or previous.get("label") == baseline:
+                return previous
+        return None
+    
+    @staticmethod
+    def welch_t(baseline_samples, samples):
+        """Welch's t statistic for the difference in means; infinite when both sides have no variance"""
+        import statistics
+        if len(baseline_samples) < 2 or len(samples) < 2:
+            return math.inf
+        difference = statistics.mean(samples) - statistics.mean(baseline_samples)
+        error = math.sqrt(statistics.variance(samples) / len(samples) + statistics.variance(baseline_samples) / len(baseline_samples))
+        if error == 0:
+            return math.inf if difference else 0.0
+        return difference / error
+    
+    def compare(self, record, baseline):
+        """Return regression messages for p95 latency and throughput worse than the baseline beyond the threshold"""
+        import statistics
+        regressions = []
+        checks = [
+            ("p95 latency", "p95_samples", 1),
+            ("throughput", "throughput_samples", -1)
+        ]
+        for metric, key, worse in checks:
+            # Records written before empty repetitions were skipped may hold None samples
+            baseline_samples = [value for value in baseline[key] if value is not None]
+            samples = [value for value in record[key] if value is not None]
+            if not baseline_samples or not samples:
+                continue
+            before = statistics.mean(baseline_samples)
+            after = statistics.mean(samples)
+            if not before:
+                continue
+            change = (after - before) / before * worse
+            # Require the change to be both large and outside run-to-run noise (|t| > 2 is about 95% confidence)
+            significant = self.welch_t(baseline_samples, samples) * worse > 2.0
+            if change > self.threshold and significant:
+                regressions.append(f"{record['workload']}: {metric} {before:.4g} -> {after:.4g} ({change:+.1%} worse)")
+        return regressions
+    
+    def run(self, workloads=None, baseline=None):
+        """Run workloads, append them to the history file and return the regressions and failed workloads found"""
+        import statistics
+        history = self.load_history()
+        regressions = []
+        with open(self.history_path, 'a', encoding='utf-8') as f:
+            for name in workloads or self.WORKLOADS:
+                logger.info(f"Benchmark {name}: {self.warmup} warmup, {self.repetitions} x {self.iterations} timed operations")
+                record = self.run_workload(name)
+                f.write(json.dumps(record) + '\n')
+                f.flush()
+                
+                if record["failed"]:
+                    regressions.append(f"{name}: no operation succeeded ({record['errors']} errors)")
+                    logger.error(f"Benchmark {name}: FAILED, {format_latency(record['latency'])} errors={record['errors']}")
+                    continue
+                previous = self.find_baseline(history, record, baseline)
+                found = self.compare(record, previous) if previous else []
+                regressions.extend(found)
+                throughput = statistics.mean(record["throughput_samples"])
+                logger.info(
+                    f"Benchmark {name}: p95={record['latency']['p95']:.3f}s {format_latency(record['latency'])} "
+                    f"throughput={throughput:.1f}/s errors={record['errors']} "
+                    f"{'REGRESSION' if found else 'ok' if previous else 'no baseline'}"
+                )
+        for regression in regressions:
+            logger.error(f"Benchmark regression: {regression}")
+        return regressions
+
+class ModelBenchmark:
+    """Runs the same terms against every model /api/models lists, at fixed concurrency, and compares the models"""
+    
+    # Rough English characters per LLM token; the app returns text only, so token counts are estimated
+    CHARS_PER_TOKEN = 4
+    
+    def __init__(self, debugger, models=None, terms=None, concurrency=4, warmup=1, quota_scheduler=None, account_factory=None):
+        self.debugger = debugger
+        self.models = models
+        self.terms = terms or debugger.medical_terms
+        self.concurrency = concurrency
+        self.warmup = warmup
+        self.quota_scheduler = quota_scheduler or QuotaScheduler()
+        self.account_factory = account_factory
+        self.run_tag = f"models{int(time.time())}{os.getpid()}"
+        self.account_numbers = itertools.count(1)
+        self.lock = threading.Lock()
+        self.account_lock = threading.Lock()
+    
+    def fetch_models(self):
+        """Return the model names /api/models reports"""
+        response = self.debugger.get_session().get("/api/models")
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        if not response.ok or not body.get("data"):
+            raise RuntimeError(f"models returned {response.status_code}: {body.get('error', response.reason)}")
+        return body["data"]
+    
+    def new_account(self):
+        """Return credentials that have never been registered"""
+        if self.account_factory:
+            return self.account_factory.issue_one()
+        n = next(self.account_numbers)
+        return {"username": f"{self.run_tag}_{n}", "password": f"ModelPass{n}!"}
+    
+    def acquire_account(self):
+        """Reserve a translation on an account with quota left, registering a new account when all are spent"""
+        user_id = self.quota_scheduler.acquire()
+        if user_id is not None:
+            return user_id
+        # One thread registers while the others wait, so a spent pool doesn't trigger a burst of sign-ups
+        with self.account_lock:
+            user_id = self.quota_scheduler.acquire()
+            if user_id is not None:
+                return user_id
+            account = self.new_account()
+            self.debugger.api_authenticate("register", account)
+            new_user_id, error = self.debugger.api_authenticate("login", account)
+            if new_user_id is None:
+                raise RuntimeError(f"Model benchmark account setup failed: {error}")
+            self.quota_scheduler.add(new_user_id)
+            return self.quota_scheduler.acquire()
+    
+    def translate(self, model, term):
+        """Translate one term with a model; returns (status, seconds to response, body), retrying once past a spent quota"""
+        for _ in range(2):
+            user_id = self.acquire_account()
+            started = time.perf_counter()
+            response, body = self.debugger.post_json("/api/translate", {"userId": user_id, "medicalText": term, "model": model})
+            elapsed = time.perf_counter() - started
+            self.quota_scheduler.release(user_id, response.status_code, body)
+            # A 403 says the account ran out, not that the model failed
+            if response.status_code != 403:
+                break
+        return response.status_code, elapsed, body
+    
+    def run_model(self, model):
+        """Translate every term with one model and return its latency, output length, error and fallback figures"""
+        for term in self.terms[:self.warmup]:
+            self.translate(model, term)
+        
+        latency = LatencyHistogram()
+        stats = {"requests": 0, "succeeded": 0, "errors": 0, "fallbacks": 0, "output_chars": 0, "output_tokens": 0, "busy": 0.0}
+        error_samples = []
+        
+        def run_term(term):
+            try:
+                status, elapsed, body = self.translate(model, term)
+            except HTTP_ERRORS as e:
+                status, elapsed, body = None, 0.0, {"error": str(e)}
+            data = body.get("data") or {}
+            with self.lock:
+                stats["requests"] += 1
+                if status != 200 or not body.get("success"):
+                    stats["errors"] += 1
+                    if len(error_samples) < 5:
+                        error_samples.append(f"{status}: {body.get('error')}")
+                elif data.get("partial"):
+                    # The answer came from the fallback model, so its time and length say nothing about this one
+                    stats["fallbacks"] += 1
+                else:
+                    explanation = data.get("explanation") or ""
+                    latency.record(elapsed)
+                    stats["succeeded"] += 1
+                    stats["busy"] += elapsed
+                    stats["output_chars"] += len(explanation)
+                    stats["output_tokens"] += math.ceil(len(explanation) / self.CHARS_PER_TOKEN)
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            list(executor.map(run_term, self.terms))
+        wall = time.perf_counter() - started
+        
+        requests_made, succeeded = stats["requests"], stats["succeeded"]
+        return {
+            "model": model,
+            "requests": requests_made,
+            "succeeded": succeeded,
+            "error_rate": stats["errors"] / requests_made if requests_made else 0.0,
+            "fallback_rate": stats["fallbacks"] / requests_made if requests_made else 0.0,
+            "latency": latency.summary(),
+            "throughput": succeeded / wall if wall else 0.0,
+            "mean_output_chars": stats["output_chars"] / succeeded if succeeded else 0.0,
+            "mean_output_tokens": stats["output_tokens"] / succeeded if succeeded else 0.0,
+            # Per-request generation speed, and what the model sustained across the whole run at this concurrency
+            "tokens_per_second": stats["output_tokens"] / stats["busy"] if stats["busy"] else 0.0,
+            "aggregate_tokens_per_second": stats["output_tokens"] / wall if wall else 0.0,
+            "errors": error_samples
+        }
+    
+    def run(self, path='medical_terms_model_benchmark.json'):
+        """Benchmark each model in turn, log a comparison table and write the results as JSON"""
+        models = self.models or self.fetch_models()
+        logger.info(f"Model benchmark: {len(self.terms)} terms x {len(models)} models at concurrency {self.concurrency}")
+        results = []
+        for model in models:
+            result = self.run_model(model)
+            results.append(result)
+            logger.info(
+                f"Model {model}: {format_latency(result['latency'])} throughput={result['throughput']:.2f}/s "
+                f"tokens/s={result['tokens_per_second']:.1f} output={result['mean_output_tokens']:.0f} tokens "
+                f"errors={result['error_rate']:.1%} fallbacks={result['fallback_rate']:.1%}"
+            )
+        
+        # Models that only failed or fell back have no latency to rank by; they stay in the JSON with their rates
+        ranked = sorted((result for result in results if result["latency"]["p50"] is not None), key=lambda result: result["latency"]["p50"])
+        if ranked:
+            logger.info(f"Models by median time to response: {', '.join(result['model'] for result in ranked)}")
+        with open(path, 'w') as f:
+            json.dump({"generated": datetime.now().isoformat(), "base_url": self.debugger.base_url,
+                       "concurrency": self.concurrency, "terms": len(self.terms), "models": results}, f, indent=2)
+        logger.info(f"Model benchmark results written to {path}")
+        return results
+
+class AuthStress:
+    """Ramps concurrent register, login and same-username register bursts against /api/auth"""
+    
+    PHASES = ["register", "login", "duplicate"]
+    
+    def __init__(self, debugger, levels=(1, 2, 4, 8, 16), rounds=5, race_size=4, account_factory=None):
+        self.debugger = debugger
+        self.levels = sorted(levels)
+        self.rounds = rounds
+        self.race_size = race_size
+        self.account_factory = account_factory
+        self.run_tag = f"auth{int(time.time())}{os.getpid()}"
+        self.account_numbers = itertools.count(1)
+    
+    def new_account(self):
+        """Return credentials that have never been registered"""
+        if self.account_factory:
+            return self.account_factory.issue_one()
+        n = next(self.account_numbers)
+        return {"username": f"{self.run_tag}_{n}", "password": f"AuthPass{n}!"}
+    
+    def new_accounts(self, count):
+        """Return count never-registered credentials, refusing a burst that would repeat a username"""
+        accounts = [self.new_account() for _ in range(count)]
+        repeated = [username for username, uses in Counter(account["username"] for account in accounts).items() if uses > 1]
+        if repeated:
+            raise RuntimeError(f"Auth stress burst would reuse usernames {', '.join(repeated[:5])}")
+        return accounts
+    
+    def call(self, action, account, barrier=None):
+        """POST /api/auth once, optionally released together with other threads, and return (status, seconds)"""
+        if barrier:
+            barrier.wait()
+        started = time.perf_counter()
+        try:
+            response, _ = self.debugger.post_json("/api/auth", {
+                "action": action,
+                "username": account["username"],
+                "password": account["password"]
+            })
+            status = response.status_code
+        except HTTP_ERRORS:
+            status = None
+        return status, time.perf_counter() - started
+    
+    @staticmethod
+    def summarize(outcomes, wall):
+        """Return latency, status shares and throughput for a list of (status, seconds)"""
+        latency = LatencyHistogram()
+        statuses = Counter()
+        for status, elapsed in outcomes:
+            latency.record(elapsed)
+            statuses["error" if status is None else str(status)] += 1
+        total = len(outcomes)
+        return {
+            "requests": total,
+            "latency": latency.summary(),
+            "statuses": dict(statuses),
+            "status_shares": {status: count / total for status, count in statuses.items()} if total else {},
+            "throughput": statuses["200"] / wall if wall else 0.0
+        }
+    
+    def burst(self, level, calls):
+        """Run (action, account) calls with level in flight and return their summary"""
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=level) as executor:
+            outcomes = list(executor.map(lambda item: self.call(*item), calls))
+        return self.summarize(outcomes, time.perf_counter() - started)
+    
+    def race(self, level):
+        """Register one username from race_size threads at once, level races at a time, and count double registrations"""
+        races = self.new_accounts(max(1, level // self.race_size))
+        contenders = [
+            (race, {"username": account["username"], "password": f"{account['password']}{i}"})
+            for race, account in enumerate(races) for i in range(self.race_size)
+        ]
+        barrier = threading.Barrier(len(contenders))
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(contenders)) as executor:
+            outcomes = list(executor.map(lambda item: self.call("register", item[1], barrier), contenders))
+        summary = self.summarize(outcomes, time.perf_counter() - started)
+        
+        winners = Counter(race for (race, _), (status, _) in zip(contenders, outcomes) if status == 200)
+        # Each contender used its own password, so more than one working login means more than one user row
+        logins = Counter(race for race, account in contenders if self.call("login", account)[0] == 200)
+        summary["races"] = len(races)
+        summary["double_registrations"] = sum(1 for race in range(len(races)) if winners[race] > 1 or logins[race] > 1)
+        return summary
+    
+    def run_level(self, level):
+        """Run the register, login and duplicate bursts at one concurrency level"""
+        accounts = self.new_accounts(level * self.rounds)
+        result = {"concurrency": level}
+        result["register"] = self.burst(level, [("register", account) for account in accounts])
+        result["login"] = self.burst(level, [("login", account) for account in accounts])
+        result["duplicate"] = self.race(max(level, self.race_size))
+        return result
+    
+    @staticmethod
+    def ceiling(results, phase):
+        """Return the concurrency past which successful throughput stops growing by 10% or more"""
+        best = None
+        for result in results:
+            if best is None or result[phase]["throughput"] >= best[phase]["throughput"] * 1.1:
+                best = result
+        return {"concurrency": best["concurrency"], "throughput": best[phase]["throughput"]} if best else None
+    
+    def run(self, path='medical_terms_auth_stress.json'):
+        """Ramp through the concurrency levels, log each one and write the results as JSON"""
+        results = []
+        for level in self.levels:
+            result = self.run_level(level)
+            results.append(result)
+            for phase in self.PHASES:
+                summary = result[phase]
+                logger.info(
+                    f"Auth concurrency {level} {phase}: {format_latency(summary['latency'])} "
+                    f"throughput={summary['throughput']:.1f}/s statuses={summary['statuses']}"
+                )
+            if result["duplicate"]["double_registrations"]:
+                logger.error(f"Auth concurrency {level}: {result['duplicate']['double_registrations']} of "
+                             f"{result['duplicate']['races']} duplicate races registered the username twice")
+        
+        ceilings = {phase: self.ceiling(results, phase) for phase in ("register", "login")}
+        for phase, ceiling in ceilings.items():
+            if ceiling:
+                logger.info(f"Auth {phase} throughput ceiling: {ceiling['throughput']:.1f}/s at concurrency {ceiling['concurrency']}")
+        with open(path, 'w') as f:
+            json.dump({"generated": datetime.now().isoformat(), "base_url": self.debugger.base_url,
+                       "rounds": self.rounds, "race_size": self.race_size, "ceilings": ceilings, "levels": results}, f, indent=2)
+        logger.info(f"Auth stress results written to {path}")
+        return results
+
+class WebhookReplay:
+    """Replays signed synthetic Stripe subscription lifecycles at /api/stripe-webhook, with redeliveries and reordering"""
+    
+    def __init__(self, debugger, secret, subscriptions=20, renewals=2, cancel_rate=0.3, duplicate_rate=0.1,
+                 reorder_rate=0.1, invalid_rate=0.02, rate=50.0, concurrency=8, state_url=None, state_key=None,
+                 account_factory=None, seed=None):
+        self.debugger = debugger
+        self.secret = secret
+        self.subscriptions = subscriptions
+        self.renewals = renewals
+        self.cancel_rate = cancel_rate
+        self.duplicate_rate = duplicate_rate
+        self.reorder_rate = reorder_rate
+        self.invalid_rate = invalid_rate
+        self.rate = rate
+        self.concurrency = concurrency
+        self.state_url = state_url
+        self.state_key = state_key
+        self.account_factory = account_factory
+        self.rng = random.Random(seed)
+        self.run_tag = f"wh{int(time.time())}{os.getpid()}"
+        self.event_ids = itertools.count(1)
+        self.lock = threading.Lock()
+    
+    @staticmethod
+    def sign(payload, secret, timestamp=None):
+        """Return a Stripe-Signature header for payload: t=timestamp,v1=HMAC-SHA256(secret, 't.payload')"""
+        import hashlib
+        import hmac
+        timestamp = int(time.time()) if timestamp is None else timestamp
+        signature = hmac.new(secret.encode('utf-8'), f"{timestamp}.".encode('ascii') + payload, hashlib.sha256).hexdigest()
+        return f"t={timestamp},v1={signature}"
+    
+    def event(self, event_type, obj, created):
+        """Build a Stripe event envelope around obj"""
+        return {
+            "id": f"evt_{self.run_tag}_{next(self.event_ids)}",
+            "object": "event",
+            "type": event_type,
+            "created": created,
+            "livemode": False,
+            "data": {"object": obj}
+        }
+    
+    def lifecycle(self, n, user_id, created):
+        """Return one subscription's events in the order Stripe creates them, and the state they should leave"""
+        customer, subscription = f"cus_{self.run_tag}_{n}", f"sub_{self.run_tag}_{n}"
+        events = [
+            self.event("checkout.session.completed", {
+                "id": f"cs_{self.run_tag}_{n}", "object": "checkout.session", "customer": customer,
+                "subscription": subscription, "metadata": {"userId": str(user_id), "planId": "2"}
+            }, created),
+            self.event("customer.subscription.created", {"id": subscription, "object": "subscription", "customer": customer, "status": "active"}, created + 1)
+        ]
+        for renewal in range(self.renewals):
+            # A failed payment that a retry recovers flips the subscription to past_due and back
+            if self.rng.random() < 0.3:
+                events.append(self.event("invoice.payment_failed", {"id": f"in_{self.run_tag}_{n}_{renewal}f", "object": "invoice", "customer": customer, "subscription": subscription}, created + len(events)))
+                events.append(self.event("customer.subscription.updated", {"id": subscription, "object": "subscription", "customer": customer, "status": "past_due"}, created + len(events)))
+                events.append(self.event("customer.subscription.updated", {"id": subscription, "object": "subscription", "customer": customer, "status": "active"}, created + len(events)))
+            events.append(self.event("invoice.payment_succeeded", {"id": f"in_{self.run_tag}_{n}_{renewal}", "object": "invoice", "customer": customer, "subscription": subscription}, created + len(events)))
+        cancelled = self.rng.random() < self.cancel_rate
+        if cancelled:
+            events.append(self.event("customer.subscription.deleted", {"id": subscription, "object": "subscription", "customer": customer, "status": "canceled"}, created + len(events)))
+        return events, {"user_id": user_id, "stripe_subscription_id": subscription, "is_active": not cancelled}
+    
+    def create_users(self):
+        """Register and log in one account per subscription, since user_subscriptions rows reference real users"""
+        if self.account_factory:
+            accounts = self.account_factory.fresh(self.subscriptions)
+        else:
+            accounts = ({"username": f"{self.run_tag}_{n}", "password": f"HookPass{n}!"} for n in range(1, self.subscriptions + 1))
+        user_ids = []
+        for account in accounts:
+            self.debugger.api_authenticate("register", account)
+            user_id, error = self.debugger.api_authenticate("login", account)
+            if user_id is None:
+                raise RuntimeError(f"Webhook replay account setup failed: {error}")
+            user_ids.append(user_id)
+        # Subscriptions sharing a user would overwrite each other's row and make convergence meaningless
+        if len(set(user_ids)) < len(user_ids):
+            raise RuntimeError(f"Webhook replay accounts resolved to {len(set(user_ids))} users for {len(user_ids)} subscriptions")
+        return user_ids
+    
+    def schedule(self, user_ids):
+        """Interleave the lifecycles and add redeliveries, local reordering and invalid signatures; returns (deliveries, expected)"""
+        created = int(time.time())
+        streams, expected = [], {}
+        for n, user_id in enumerate(user_ids, 1):
+            events, state = self.lifecycle(n, user_id, created)
+            streams.append(deque(events))
+            expected[state["stripe_subscription_id"]] = state
+        
+        # Canonical order: each subscription's events stay in sequence while subscriptions interleave randomly
+        deliveries = []
+        while streams:
+            index = self.rng.randrange(len(streams))
+            stream = streams[index]
+            deliveries.append({"event": stream.popleft(), "duplicate": False, "invalid": False})
+            if not stream:
+                # Swap-remove keeps finishing a stream O(1); the order of the stream list doesn't matter
+                streams[index] = streams[-1]
+                streams.pop()
+        
+        for i in range(len(deliveries) - 1):
+            if self.rng.random() < self.reorder_rate:
+                j = min(len(deliveries) - 1, i + self.rng.randint(1, 5))
+                deliveries[i], deliveries[j] = deliveries[j], deliveries[i]
+        # Extra copies get a random position key and everything is sorted once, which stays O(n log n) for retry storms.
+        # Redeliveries arrive after the original, as Stripe retries do, so a late copy can undo newer state
+        count = len(deliveries)
+        keyed = [(position, delivery) for position, delivery in enumerate(deliveries)]
+        for position, delivery in enumerate(deliveries):
+            if self.rng.random() < self.duplicate_rate:
+                keyed.append((self.rng.uniform(position, count), dict(delivery, duplicate=True)))
+            if self.rng.random() < self.invalid_rate:
+                keyed.append((self.rng.uniform(0, count), dict(delivery, invalid=True)))
+        keyed.sort(key=lambda item: item[0])
+        return [delivery for _, delivery in keyed], expected
+    
+    def deliver(self, delivery, due):
+        """POST one delivery, signed at send time as Stripe does, and return (status, seconds late, seconds to respond)"""
+        payload = json.dumps(delivery["event"], separators=(",", ":")).encode('utf-8')
+        # An invalid delivery is signed with the wrong secret and must be rejected without being applied
+        signature = self.sign(payload, "whsec_wrong" if delivery["invalid"] else self.secret)
+        started = time.perf_counter()
+        try:
+            response = self.debugger.get_session().request("POST", "/api/stripe-webhook", data=payload,
+                                                          headers={"Stripe-Signature": signature})
+            status = response.status_code
+        except HTTP_ERRORS:
+            status = None
+        return status, started - due, time.perf_counter() - started
+    
+    def replay(self, deliveries):
+        """Send deliveries at the configured rate with at most concurrency in flight; returns per-type stats"""
+        by_type, lag = {}, LatencyHistogram()
+        statuses, unexpected = Counter(), []
+        limiter = threading.BoundedSemaphore(self.concurrency)
+        
+        def send(delivery, due):
+            try:
+                status, late, elapsed = self.deliver(delivery, due)
+            finally:
+                limiter.release()
+            expected_status = 400 if delivery["invalid"] else 200
+            kind = "invalid" if delivery["invalid"] else delivery["event"]["type"]
+            with self.lock:
+                by_type.setdefault(kind, LatencyHistogram()).record(elapsed)
+                lag.record(max(0.0, late))
+                statuses["error" if status is None else str(status)] += 1
+                if status != expected_status and len(unexpected) < 20:
+                    unexpected.append(f"{kind} {delivery['event']['id']}: {status}, expected {expected_status}")
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            for i, delivery in enumerate(deliveries):
+                due = started + i / self.rate if self.rate else started
+                time.sleep(max(0.0, due - time.perf_counter()))
+                # Waiting here when every slot is busy is what makes later deliveries run late
+                limiter.acquire()
+                executor.submit(send, delivery, due)
+        elapsed = time.perf_counter() - started
+        return {
+            "deliveries": len(deliveries),
+            "elapsed": elapsed,
+            "throughput": len(deliveries) / elapsed if elapsed else 0.0,
+            "statuses": dict(statuses),
+            "unexpected_statuses": unexpected,
+            "send_lag": lag.summary(),
+            "latency": {kind: histogram.summary() for kind, histogram in sorted(by_type.items())}
+        }
+    
+    def fetch_state(self, subscription_ids):
+        """Read the subscriptions' rows from Supabase's REST API (or the mock's copy of it)"""
+        client = HTTPClient(self.state_url, timeout=30)
+        headers = {"apikey": self.state_key, "Authorization": f"Bearer {self.state_key}"} if self.state_key else None
+        try:
+            response = client.get("/rest/v1/user_subscriptions", params={
+                "select": "user_id,stripe_subscription_id,is_active,end_date",
+                "stripe_subscription_id": f"in.({','.join(subscription_ids)})"
+            }, headers=headers)
+        finally:
+            client.close()
+        if not response.ok:
+            raise RuntimeError(f"user_subscriptions returned {response.status_code}")
+        return {row["stripe_subscription_id"]: row for row in response.json()}
+    
+    def check_convergence(self, expected):
+        """Compare each subscription's final row with the state its events in creation order should leave"""
+        rows = self.fetch_state(list(expected))
+        diverged = []
+        for subscription_id, state in expected.items():
+            row = rows.get(subscription_id)
+            if row is None:
+                diverged.append({"subscription": subscription_id, "expected_active": state["is_active"], "actual": None})
+            elif bool(row.get("is_active")) != state["is_active"]:
+                diverged.append({"subscription": subscription_id, "expected_active": state["is_active"], "actual": row})
+        return {"subscriptions": len(expected), "converged": len(expected) - len(diverged), "diverged": diverged[:20]}
+    
+    def run(self, path='medical_terms_webhook_replay.json'):
+        """Create users, replay their event streams, check the final state and write the results as JSON"""
+        deliveries, expected = self.schedule(self.create_users())
+        logger.info(
+            f"Webhook replay: {len(deliveries)} deliveries for {len(expected)} subscriptions "
+            f"({sum(d['duplicate'] for d in deliveries)} redeliveries, {sum(d['invalid'] for d in deliveries)} invalid) "
+            f"at {self.rate}/s, concurrency {self.concurrency}"
+        )
+        result = self.replay(deliveries)
+        for kind, summary in result["latency"].items():
+            logger.info(f"Webhook {kind}: {format_latency(summary)}")
+        logger.info(f"Webhook replay: {result['throughput']:.1f} deliveries/s, statuses {result['statuses']}, "
+                    f"send lag {format_latency(result['send_lag'])}")
+        for message in result["unexpected_statuses"]:
+            logger.warning(f"Webhook unexpected status: {message}")
+        
+        if self.state_url:
+            result["convergence"] = self.check_convergence(expected)
+            convergence = result["convergence"]
+            logger.info(f"Webhook state: {convergence['converged']} of {convergence['subscriptions']} subscriptions converged")
+            for divergence in convergence["diverged"]:
+                logger.error(f"Webhook state diverged: {divergence}")
+        else:
+            result["convergence"] = None
+            logger.warning("No Supabase URL given; final subscription state was not checked")
+        
+        with open(path, 'w') as f:
+            json.dump({"generated": datetime.now().isoformat(), "base_url": self.debugger.base_url, **result}, f, indent=2)
+        logger.info(f"Webhook replay results written to {path}")
+        return result
+
+class HistoryScalingProbe:
+    """Grows one account's history through /api/translate and measures /api/history, full and paginated, at each size"""
+    
+    def __init__(self, debugger, sizes=(10, 1000, 100000), page_size=100, repeats=5, seed_workers=8):
+        self.debugger = debugger
+        self.sizes = sorted(sizes)
+        self.page_size = page_size
+        self.repeats = repeats
+        self.seed_workers = seed_workers
+        self.run_tag = f"history{int(time.time())}{os.getpid()}"
+    
+    def seed(self, user_id, seeded, target):
+        """Translate until the account holds target entries, returning the count reached; stops early on 403"""
+        terms = itertools.cycle(self.debugger.medical_terms)
+        
+        def translate(term):
+            # Bypasses the translation cache: every call must create a history row
+            response, body = self.debugger.post_json("/api/translate", {"userId": user_id, "medicalText": term})
+            return response.status_code, body
+        
+        with ThreadPoolExecutor(max_workers=self.seed_workers) as executor:
+            while seeded < target:
+                batch = min(target - seeded, self.seed_workers * 50)
+                statuses = [status for status, _ in executor.map(translate, itertools.islice(terms, batch))]
+                seeded += statuses.count(200)
+                if 403 in statuses:
+                    logger.warning(f"History seeding stopped at {seeded} entries: translation quota reached")
+                    break
+                if not statuses.count(200):
+                    logger.warning(f"History seeding stopped at {seeded} entries: translate returned {statuses[0]}")
+                    break
+        return seeded
+    
+    def fetch(self, params):
+        """GET /api/history and return (seconds to headers, total seconds, body bytes)"""
+        started = time.perf_counter()
+        response = self.debugger.get_session().get("/api/history", params=params)
+        finished = time.perf_counter()
+        if not response.ok:
+            raise RuntimeError(f"history returned {response.status_code}")
+        return response.headers_seconds, finished - started, response.content
+    
+    @staticmethod
+    def decode(body):
+        """Parse a response body, returning it with the peak Python memory the parse needed"""
+        import tracemalloc
+        tracemalloc.start()
+        try:
+            payload = json.loads(body)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return payload, peak
+    
+    def measure_full(self, user_id):
+        """Time the unpaginated endpoint and report its size and decode memory"""
+        ttfb, latency = LatencyHistogram(), LatencyHistogram()
+        for _ in range(self.repeats):
+            headers, total, body = self.fetch({"userId": user_id})
+            ttfb.record(headers)
+            latency.record(total)
+        payload, peak = self.decode(body)
+        return {
+            "entries": len(payload.get("data", [])),
+            "response_bytes": len(body),
+            "decode_peak_bytes": peak,
+            "ttfb": ttfb.summary(),
+            "latency": latency.summary()
+        }
+    
+    def measure_pages(self, user_id, expected):
+        """Walk every page and check the walk returns each entry once, newest first"""
+        latency = LatencyHistogram()
+        issues, seen, previous = [], set(), None
+        largest_page, peak_memory, pages, cursor = 0, 0, 0, None
+        walk_started = time.perf_counter()
+        while True:
+            params = {"userId": user_id, "limit": self.page_size}
+            if cursor:
+                params["cursor"] = cursor
+            _, total, body = self.fetch(params)
+            latency.record(total)
+            payload, peak = self.decode(body)
+            pages += 1
+            largest_page = max(largest_page, len(body))
+            peak_memory = max(peak_memory, peak)
+            if "nextCursor" not in payload:
+                issues.append("endpoint ignores limit and returned an unpaginated response")
+                break
+            for entry in payload["data"]:
+                key = (entry["submittedAt"], entry["submissionId"])
+                if entry["submissionId"] in seen:
+                    issues.append(f"submission {entry['submissionId']} returned twice")
+                if previous is not None and key > previous:
+                    issues.append(f"submission {entry['submissionId']} out of order")
+                seen.add(entry["submissionId"])
+                previous = key
+            if len(payload["data"]) > self.page_size:
+                issues.append(f"page of {len(payload['data'])} entries exceeds limit {self.page_size}")
+            cursor = payload["nextCursor"]
+            if not cursor:
+                break
+        if len(seen) != expected and not issues:
+            issues.append(f"walk returned {len(seen)} entries, expected {expected}")
+        return {
+            "pages": pages,
+            "entries": len(seen),
+            "walk_seconds": time.perf_counter() - walk_started,
+            "largest_page_bytes": largest_page,
+            "decode_peak_bytes": peak_memory,
+            "page_latency": latency.summary(),
+            "verified": not issues,
+            "issues": issues[:20]
+        }
+    
+    def run(self, path='medical_terms_history_scaling.json'):
+        """Seed and measure each history size in turn, then write the results as JSON"""
+        account = {"username": self.run_tag, "password": "HistoryPass1!"}
+        self.debugger.api_authenticate("register", account)
+        user_id, error = self.debugger.api_authenticate("login", account)
+        if user_id is None:
+            raise RuntimeError(f"History probe account setup failed: {error}")
+        
+        results, seeded = [], 0
+        for size in self.sizes:
+            seed_started = time.perf_counter()
+            seeded = self.seed(user_id, seeded, size)
+            logger.info(f"History seeded to {seeded} entries in {time.perf_counter() - seed_started:.1f}s")
+            result = {"target": size, "entries": seeded, "full": self.measure_full(user_id), "paginated": self.measure_pages(user_id, seeded)}
+            results.append(result)
+            full, paginated = result["full"], result["paginated"]
+            logger.info(
+                f"History {seeded} entries: full {full['response_bytes']} bytes, {format_latency(full['latency'])}, "
+                f"decode peak {full['decode_peak_bytes']} bytes; paginated {paginated['pages']} pages, "
+                f"{format_latency(paginated['page_latency'])}, largest page {paginated['largest_page_bytes']} bytes, "
+                f"{'verified' if paginated['verified'] else 'FAILED: ' + '; '.join(paginated['issues'][:3])}"
+            )
+            if seeded < size:
+                break
+        
+        with open(path, 'w') as f:
+            json.dump({"generated": datetime.now().isoformat(), "base_url": self.debugger.base_url,
+                       "page_size": self.page_size, "sizes": results}, f, indent=2)
+        logger.info(f"History scaling results written to {path}")
+        return results
+
+class RollingWindow:
+    """Fixed-memory sliding window of per-step latency histograms and outcome counts, kept as a ring of time buckets"""
+    
+    def __init__(self, window=900, buckets=60):
+        self.window = window
+        self.bucket_seconds = window / buckets
+        # Old buckets fall off the ring, so memory is bounded by buckets x steps x histogram size
+        self.buckets = deque(maxlen=buckets)
+        self.lock = threading.Lock()
+    
+    def record(self, step, seconds, ok, now=None):
+        """Add one probe step outcome to the current bucket"""
+        index = int((now or time.time()) // self.bucket_seconds)
+        with self.lock:
+            if not self.buckets or self.buckets[-1][0] != index:
+                self.buckets.append((index, {}))
+            stats = self.buckets[-1][1].setdefault(step, {"latency": LatencyHistogram(), "errors": 0})
+            stats["latency"].record(seconds)
+            stats["errors"] += not ok
+    
+    def snapshot(self, now=None):
+        """Merge the buckets still inside the window into per-step latency summaries and error rates"""
+        oldest = int(((now or time.time()) - self.window) // self.bucket_seconds)
+        merged = {}
+        with self.lock:
+            for index, steps in self.buckets:
+                if index <= oldest:
+                    continue
+                for step, stats in steps.items():
+                    target = merged.setdefault(step, {"latency": LatencyHistogram(), "errors": 0})
+                    target["latency"].merge(stats["latency"])
+                    target["errors"] += stats["errors"]
+        return {
+            step: dict(stats["latency"].summary(), errors=stats["errors"],
+                       error_rate=stats["errors"] / stats["latency"].count if stats["latency"].count else 0.0)
+            for step, stats in merged.items()
+        }
+
+def metrics_request_handler():
+    """Build the metrics endpoint's handler class; http.server is only imported once a monitor serves metrics"""
+    from http.server import BaseHTTPRequestHandler
+    
+    class MetricsRequestHandler(BaseHTTPRequestHandler):
+        """Serves the monitor's rolling aggregates as Prometheus text at /metrics and as JSON at /metrics.json"""
+        
+        protocol_version = "HTTP/1.1"
+        
+        def log_message(self, format, *args):
+            logger.debug(f"Metrics {self.address_string()} {format % args}")
+        
+        def do_GET(self):
+            path = urlparse(self.path).path
+            if path == "/metrics":
+                body, content_type = self.server.monitor.prometheus_text().encode('utf-8'), "text/plain; version=0.0.4"
+            elif path == "/metrics.json":
+                body, content_type = json.dumps(self.server.monitor.metrics()).encode('utf-8'), "application/json"
+            elif path == "/healthz":
+                body, content_type = b"ok\n", "text/plain"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+    
+    return MetricsRequestHandler
+
+def current_rss_bytes():
+    """Return this process's resident set size, or None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class SyntheticMonitor:
+    """Long-running probe of reachability, login and translate over warm sessions, with rolling metrics"""
+    
+    def __init__(self, debugger, interval=60, window=900, translate_every=1, quota_limit=5,
+                 account_factory=None, max_driver_uses=500):
+        self.debugger = debugger
+        self.api = isinstance(debugger, MedicalTermsAPIDebugger)
+        self.interval = interval
+        self.translate_every = max(1, translate_every)
+        self.quota_limit = quota_limit
+        self.account_factory = account_factory
+        self.max_driver_uses = max_driver_uses
+        self.window = RollingWindow(window)
+        self.session = HTTPClient(debugger.base_url, timeout=10)
+        self.totals = {}
+        self.last_success = {}
+        self.probes = 0
+        self.driver_uses = 0
+        self.account = None
+        self.user_id = None
+        self.quota_left = 0
+        self.run_tag = f"monitor{int(time.time())}{os.getpid()}"
+        self.account_numbers = itertools.count(1)
+        self.stop_event = threading.Event()
+        self.started_at = time.time()
+    
+    def new_account(self):
+        """Return credentials that have never been registered"""
+        if self.account_factory:
+            return self.account_factory.issue_one()
+        n = next(self.account_numbers)
+        return {"username": f"{self.run_tag}_{n}", "password": f"MonitorPass{n}!"}
+    
+    def ensure_driver(self):
+        """Keep one browser session warm, restarting it when it dies or reaches max_driver_uses probes"""
+        if self.debugger.driver and self.driver_uses < self.max_driver_uses and self.debugger.is_driver_alive(self.debugger.driver):
+            return
+        self.debugger.close_driver()
+        self.debugger.setup_driver()
+        self.driver_uses = 0
+    
+    def ensure_account(self):
+        """Register a new probe account when there is none or its translation quota is spent"""
+        if self.account is not None and self.quota_left != 0:
+            return
+        self.account = self.new_account()
+        self.user_id = None
+        self.quota_left = self.quota_limit
+        if self.api:
+            self.debugger.api_authenticate("register", self.account)
+        else:
+            self.debugger.driver.get(self.debugger.base_url)
+            self.debugger.wait_for_page_ready()
+            self.debugger.attempt_account_creation(self.account)
+        logger.info(f"Monitor probing as {self.account['username']}")
+    
+    def probe_login(self):
+        if self.api:
+            self.user_id, _ = self.debugger.api_authenticate("login", self.account)
+            return self.user_id is not None
+        self.debugger.reset_browser_state()
+        self.debugger.driver.get(self.debugger.base_url)
+        self.debugger.wait_for_page_ready()
+        return self.debugger.attempt_login(self.account)
+    
+    def probe_translate(self):
+        term = random.choice(self.debugger.medical_terms)
+        if not self.api:
+            self.quota_left -= 1
+            return self.debugger.attempt_medical_translation(term) is not None
+        response, body = self.debugger.post_json("/api/translate", {"userId": self.user_id, "medicalText": term})
+        data = body.get("data") or {}
+        if response.status_code == 403:
+            self.quota_left = 0
+        elif data.get("subscription") and not data.get("partial"):
+            self.quota_left = data["subscription"].get("remaining", self.quota_left - 1)
+        else:
+            self.quota_left -= 1
+        return response.ok and body.get("success", False)
+    
+    def run_step(self, step, probe):
+        """Time one probe step, record its outcome and return whether it succeeded"""
+        started = time.perf_counter()
+        try:
+            ok = bool(probe())
+        except Exception as e:
+            logger.warning(f"Monitor {step} probe failed: {e}")
+            ok = False
+        self.window.record(step, time.perf_counter() - started, ok)
+        key = (step, "ok" if ok else "error")
+        self.totals[key] = self.totals.get(key, 0) + 1
+        if ok:
+            self.last_success[step] = time.time()
+        return ok
+    
+    def probe(self):
+        """Run one reachability -> login -> translate probe, stopping at the first failed step"""
+        self.probes += 1
+        if not self.run_step("reachability", lambda: self.debugger.check_website_accessibility(self.session)):
+            return
+        try:
+            if not self.api:
+                self.ensure_driver()
+                self.driver_uses += 1
+            self.ensure_account()
+        except Exception as e:
+            logger.warning(f"Monitor setup failed: {e}")
+            self.debugger.close_driver()
+            return
+        if not self.run_step("login", self.probe_login):
+            return
+        if self.probes % self.translate_every == 0:
+            self.run_step("translate", self.probe_translate)
+    
+    def metrics(self):
+        """Return rolling-window aggregates, lifetime counters and process footprint"""
+        return {
+            "window_seconds": self.window.window,
+            "steps": self.window.snapshot(),
+            "totals": {f"{step}:{outcome}": count for (step, outcome), count in self.totals.items()},
+            "last_success": self.last_success,
+            "probes": self.probes,
+            "uptime_seconds": time.time() - self.started_at,
+            "cpu_seconds": time.process_time(),
+            "rss_bytes": current_rss_bytes()
+        }
+    
+    def prometheus_text(self):
+        """Render metrics() in the Prometheus text exposition format"""
+        metrics = self.metrics()
+        lines = [
+            "# TYPE medical_terms_probe_latency_seconds summary",
+            "# TYPE medical_terms_probe_error_rate gauge",
+            "# TYPE medical_terms_probe_total counter",
+            "# TYPE medical_terms_probe_last_success_timestamp_seconds gauge"
+        ]
+        for step, stats in metrics["steps"].items():
+            for quantile, key in (("0.5", "p50"), ("0.9", "p90"), ("0.99", "p99")):
+                lines.append(f'medical_terms_probe_latency_seconds{{step="{step}",quantile="{quantile}"}} {stats[key]}')
+            lines.append(f'medical_terms_probe_latency_seconds_count{{step="{step}"}} {stats["count"]}')
+            lines.append(f'medical_terms_probe_error_rate{{step="{step}"}} {stats["error_rate"]}')
+        for (step, outcome), count in self.totals.items():
+            lines.append(f'medical_terms_probe_total{{step="{step}",outcome="{outcome}"}} {count}')
+        for step, timestamp in self.last_success.items():
+            lines.append(f'medical_terms_probe_last_success_timestamp_seconds{{step="{step}"}} {timestamp}')
+        lines.append(f"medical_terms_monitor_cpu_seconds_total {metrics['cpu_seconds']}")
+        if metrics["rss_bytes"] is not None:
+            lines.append(f"medical_terms_monitor_resident_memory_bytes {metrics['rss_bytes']}")
+        return "\n".join(lines) + "\n"
+    
+    def serve_metrics(self, host='127.0.0.1', port=9108):
+        """Start the metrics endpoint on a daemon thread and return the server"""
+        from http.server import ThreadingHTTPServer
+        server = ThreadingHTTPServer((host, port), metrics_request_handler())
+        server.daemon_threads = True
+        server.monitor = self
+        threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+        logger.info(f"Monitor metrics at http://{host}:{server.server_address[1]}/metrics")
+        return server
+    
+    def run(self, max_probes=None):
+        """Probe every interval seconds on a fixed schedule until stopped; overruns skip ahead instead of bunching up"""
+        next_probe = time.monotonic()
+        try:
+            while not self.stop_event.is_set():
+                self.probe()
+                if max_probes and self.probes >= max_probes:
+                    break
+                next_probe += self.interval
+                now = time.monotonic()
+                if next_probe < now:
+                    next_probe += math.ceil((now - next_probe) / self.interval) * self.interval
+                self.stop_event.wait(next_probe - now)
+        finally:
+            if not self.api:
+                self.debugger.close_driver()
+    
+    def stop(self):
+        self.stop_event.set()
+
+class LogIndex:
+    """SQLite index of the JSON step events in log files, extended incrementally from the last indexed byte"""
+    
+    # Read size per batch; each batch is committed together with the new offset, so an interrupted index resumes cleanly
+    CHUNK_BYTES = 8 * 1024 * 1024
+    # Hash of a file's first bytes, to notice a log that was rotated or truncated and rewritten under the same name
+    HEAD_BYTES = 4096
+    
+    def __init__(self, path='medical_terms_log_index.sqlite3'):
+        import sqlite3
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            CREATE TABLE IF NOT EXISTS files (
+                file_id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE NOT NULL,
+                head_hash TEXT,
+                offset INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS runs (
+                run TEXT PRIMARY KEY,
+                started TEXT,
+                ended TEXT,
+                events INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS events (
+                file_id INTEGER NOT NULL,
+                run TEXT,
+                ts TEXT,
+                account TEXT,
+                phase TEXT,
+                duration REAL,
+                outcome TEXT
+            );
+            -- Covers every query, so none of them has to visit the table rows
+            CREATE INDEX IF NOT EXISTS events_run_phase ON events (run, phase, duration, outcome, account);
+            CREATE INDEX IF NOT EXISTS runs_started ON runs (started);
+        """)
+    
+    def head_hash(self, f, offset):
+        """Hash the start of the indexed region, which a log only appended to never changes"""
+        import hashlib
+        f.seek(0)
+        head = hashlib.sha1(f.read(min(self.HEAD_BYTES, offset))).hexdigest()
+        f.seek(offset)
+        return head
+    
+    def forget_file(self, file_id):
+        """Drop a file's events and recount the runs they belonged to"""
+        runs = [row[0] for row in self.conn.execute("SELECT DISTINCT run FROM events WHERE file_id = ?", (file_id,))]
+        self.conn.execute("DELETE FROM events WHERE file_id = ?", (file_id,))
+        for run in runs:
+            count, started, ended = self.conn.execute("SELECT COUNT(*), MIN(ts), MAX(ts) FROM events WHERE run = ?", (run,)).fetchone()
+            if count:
+                self.conn.execute("UPDATE runs SET events = ?, started = ?, ended = ? WHERE run = ?", (count, started, ended, run))
+            else:
+                self.conn.execute("DELETE FROM runs WHERE run = ?", (run,))
+    
+    @staticmethod
+    def parse_events(lines, file_id):
+        """Yield event rows from complete log lines, skipping free-form and non-step lines without decoding them"""
+        for line in lines:
+            if not line.startswith('{') or '"event": "step"' not in line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            yield (file_id, entry.get("run"), entry.get("ts"), entry.get("account"),
+                   entry.get("phase"), entry.get("duration"), entry.get("outcome"))
+    
+    def update(self, log_path):
+        """Index the part of log_path written since the last update and return the number of new events"""
+        if not os.path.exists(log_path):
+            return 0
+        key = os.path.abspath(log_path)
+        added = 0
+        with open(log_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            with self.conn:
+                row = self.conn.execute("SELECT file_id, head_hash, offset FROM files WHERE path = ?", (key,)).fetchone()
+                if row is None:
+                    file_id = self.conn.execute("INSERT INTO files (path) VALUES (?)", (key,)).lastrowid
+                    offset = 0
+                else:
+                    file_id, indexed_hash, offset = row
+                    if offset and (size < offset or self.head_hash(f, offset) != indexed_hash):
+                        logger.info(f"{log_path} was rotated or truncated; re-indexing it from the start")
+                        self.forget_file(file_id)
+                        self.conn.execute("UPDATE files SET head_hash = NULL, offset = 0 WHERE file_id = ?", (file_id,))
+                        offset = 0
+            
+            f.seek(offset)
+            while offset < size:
+                chunk = f.read(self.CHUNK_BYTES)
+                if not chunk:
+                    break
+                # A partly written last line is left for the next update
+                end = chunk.rfind(b'\n') + 1
+                if not end:
+                    if len(chunk) < self.CHUNK_BYTES:
+                        break
+                    end = len(chunk)
+                f.seek(offset + end)
+                # Decoding the batch once is much cheaper than letting json.loads sniff the encoding of every line
+                rows = list(self.parse_events(chunk[:end].decode('utf-8', 'replace').splitlines(), file_id))
+                with self.conn:
+                    self.conn.executemany("INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                    runs = {}
+                    for _, run, ts, *_ in rows:
+                        count, started, ended = runs.get(run, (0, ts, ts))
+                        runs[run] = (count + 1, min(started, ts), max(ended, ts))
+                    self.conn.executemany("""
+                        INSERT INTO runs (run, started, ended, events) VALUES (?, ?, ?, ?)
+                        ON CONFLICT (run) DO UPDATE SET
+                            started = MIN(started, excluded.started),
+                            ended = MAX(ended, excluded.ended),
+                            events = events + excluded.events
+                    """, [(run, started, ended, count) for run, (count, started, ended) in runs.items()])
+                    offset += end
+                    self.conn.execute("UPDATE files SET head_hash = ?, offset = ? WHERE file_id = ?",
+                                      (self.head_hash(f, offset), offset, file_id))
+                added += len(rows)
+        return added
+    
+    def recent_runs(self, count):
+        """Return the newest runs as (run, started, ended, events)"""
+        return self.conn.execute("SELECT run, started, ended, events FROM runs ORDER BY started DESC LIMIT ?", (count,)).fetchall()
+    
+    def run_filter(self, runs):
+        names = [run for run, *_ in self.recent_runs(runs)]
+        return f"run IN ({','.join('?' * len(names))})", names
+    
+    def phase_summary(self, runs=5):
+        """Per phase across the last runs: count, total, mean and max seconds and non-ok outcomes, slowest mean first"""
+        condition, names = self.run_filter(runs)
+        return self.conn.execute(f"""
+            SELECT phase, COUNT(*), SUM(duration), AVG(duration), MAX(duration), SUM(outcome != 'ok')
+            FROM events WHERE {condition}
+            GROUP BY phase ORDER BY AVG(duration) DESC
+        """, names).fetchall()
+    
+    def slowest_events(self, runs=5, limit=20, phase=None):
+        """Return the single slowest step events across the last runs, optionally for one phase"""
+        condition, names = self.run_filter(runs)
+        if phase:
+            condition, names = f"{condition} AND phase = ?", names + [phase]
+        return self.conn.execute(f"""
+            SELECT run, ts, account, phase, duration, outcome FROM events
+            WHERE {condition} ORDER BY duration DESC LIMIT ?
+        """, names + [limit]).fetchall()
+    
+    def account_breakdown(self, run=None):
+        """Return {account: {phase: seconds}} for one run (default: the newest) and the run's name"""
+        if run is None:
+            recent = self.recent_runs(1)
+            if not recent:
+                return None, {}
+            run = recent[0][0]
+        breakdown = {}
+        for account, phase, seconds in self.conn.execute(
+                "SELECT account, phase, SUM(duration) FROM events WHERE run = ? GROUP BY account, phase", (run,)):
+            breakdown.setdefault(account, {})[phase] = seconds
+        return run, breakdown
+    
+    def close(self):
+        self.conn.close()
+
+COMMANDS = ["browser", "api", "load", "bench", "models", "auth-stress", "webhooks", "logs", "report", "monitor", "history", "cleanup-accounts"]
+
+def parse_args(argv=None):
+    """Parse the subcommand and its options; without a subcommand the browser run is assumed"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("-h", "--help")):
+        argv.insert(0, "browser")
+    
+    logging_options = argparse.ArgumentParser(add_help=False)
+    logging_options.add_argument("--log-file", default="medical_terms_debug.log", help="log file, created on first write ('' for stderr only)")
+    
+    target_options = argparse.ArgumentParser(add_help=False, parents=[logging_options])
+    target_options.add_argument("--base-url", help=f"site to test (default: $MEDICAL_TERMS_BASE_URL or {DEFAULT_BASE_URL})")
+    target_options.add_argument("--mock", action="store_true", help="start the bundled local mock server and test against it")
+    target_options.add_argument("--mock-translation-limit", type=int, default=5, help="translations per user on the mock server (-1: unlimited)")
+    target_options.add_argument("--mock-racy-register", action="store_true", help="let the mock's register check and insert race, as the app's do")
+    
+    account_options = argparse.ArgumentParser(add_help=False)
+    account_options.add_argument("--account-seed", type=int, help="generate unique reproducible accounts from this seed instead of testuser1..N")
+    account_options.add_argument("--account-index", metavar="PATH", default="medical_terms_accounts.sqlite3", help="SQLite index of account lifecycle state")
+    
+    quota_options = argparse.ArgumentParser(add_help=False)
+    quota_options.add_argument("--quota-limit", type=int, default=5,
+                               help="translations per account assumed until the app reports the real quota; also skips spent warm accounts (-1: no limit)")
+    quota_options.add_argument("--quota-reserve", type=int, default=0, help="rotate an account out while it still has this many translations left")
+    
+    run_options = argparse.ArgumentParser(add_help=False, parents=[target_options, account_options])
+    run_options.add_argument("--accounts", type=int, default=10, help="number of test accounts to run")
+    run_options.add_argument("--workers", type=int, default=1, help="number of concurrent browser sessions or API workers")
+    run_options.add_argument("--skip-preflight", action="store_true", help="do not check that the site is reachable before the first account")
+    run_options.add_argument("--trace", action="store_true",
+                             help="record phase, network (DNS/connect/TTFB/download) and page timing spans per account and write a Chrome trace file")
+    run_options.add_argument("--breaker-threshold", type=int, default=3,
+                             help="skip a step after it fails the same way this many times in a row (0: never skip)")
+    run_options.add_argument("--breaker-backoff", type=float, default=30, help="seconds before a skipped step is probed again; doubles on each failed probe")
+    run_options.add_argument("--breaker-max-backoff", type=float, default=600, help="upper bound for the re-probe backoff")
+    run_options.add_argument("--stream-results", metavar="PATH", help="stream results as JSON Lines to PATH (gzip-compressed if it ends in .gz)")
+    run_options.add_argument("--resume", action="store_true", help="skip accounts already present in the --stream-results file")
+    run_options.add_argument("--terms-file", action="append", default=[], metavar="PATH", help="term or sentence file (one per line, .gz allowed); repeatable")
+    run_options.add_argument("--terms-per-account", type=int, default=2, help="translations attempted per account")
+    run_options.add_argument("--shards", type=int, default=0, help="number of worker processes draining the account queue")
+    run_options.add_argument("--queue-dir", metavar="DIR", help="work queue directory; share it between machines to distribute a run")
+    run_options.add_argument("--queue-role", choices=["all", "enqueue", "work", "merge"], default="all",
+                             help="with --queue-dir: only enqueue accounts, only drain the queue, only merge results, or all three")
+    run_options.add_argument("--chunk-size", type=int, help="accounts per queue chunk (default: about four chunks per shard)")
+    run_options.add_argument("--requeue-claimed", action="store_true", help="return chunks claimed by crashed workers to the queue before draining")
+    
+    browser_options = argparse.ArgumentParser(add_help=False)
+    browser_options.add_argument("--reuse-page-structure", action="store_true", help="skip re-capturing the page structure when its DOM hash is unchanged")
+    browser_options.add_argument("--no-locator-cache", action="store_true", help="do not read or update the persistent locator cache")
+    browser_options.add_argument("--recycle-sessions", action="store_true", help="clear cookies and storage between accounts instead of sharing browser state")
+    browser_options.add_argument("--max-driver-uses", type=int, help="restart a browser session after this many accounts")
+    browser_options.add_argument("--block-assets", action="store_true", help="block images, fonts, analytics and Stripe assets")
+    
+    model_options = argparse.ArgumentParser(add_help=False)
+    model_options.add_argument("--model", help="model to request from /api/translate")
+    
+    parser = argparse.ArgumentParser(description="Medical Terms Website Debugging Script")
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    
+    browser = commands.add_parser("browser", parents=[run_options, browser_options],
+                                  help="drive the site in headless Chrome (default)")
+    browser.set_defaults(handler=command_run, api=False)
+    
+    api = commands.add_parser("api", parents=[run_options, quota_options, model_options],
+                              help="exercise /api/auth and /api/translate directly, without a browser")
+    api.add_argument("--models", help="comma-separated models to cover each corpus term with")
+    api.add_argument("--translation-cache", metavar="PATH", help="SQLite cache of translate responses")
+    api.add_argument("--refresh-translations", action="store_true", help="call the API even for cached translations, updating the cache")
+    api.add_argument("--golden", metavar="PATH", help="diff the translation cache against this golden cache after the run")
+    api.set_defaults(handler=command_run, api=True)
+    
+    load = commands.add_parser("load", parents=[target_options, account_options, quota_options, model_options],
+                               help="open-model asyncio load test against /api/translate")
+    load.add_argument("--accounts", type=int, default=10, help="accounts the load is spread across")
+    load.add_argument("--warm-accounts", action="store_true", help="reuse logged-in accounts from the account index instead of registering new ones")
+    load.add_argument("--concurrency", type=int, default=50, help="maximum in-flight requests")
+    load.add_argument("--rate", type=float, default=10.0, help="translation arrivals per second")
+    load.add_argument("--duration", type=float, default=60, help="load test duration in seconds")
+    load.set_defaults(handler=command_load)
+    
+    bench = commands.add_parser("bench", parents=[target_options, account_options, model_options],
+                                help="run benchmark workloads and exit 1 on regression")
+    bench.add_argument("workloads", nargs="*", metavar="WORKLOAD",
+                       help=f"workloads to run ({', '.join(BenchmarkSuite.WORKLOADS)}; default: all)")
+    bench.add_argument("--warmup", type=int, default=3, help="untimed operations before each workload")
+    bench.add_argument("--iterations", type=int, default=20, help="timed operations per repetition")
+    bench.add_argument("--repetitions", type=int, default=5, help="repetitions per workload, compared as samples")
+    bench.add_argument("--threshold", type=float, default=0.10, help="relative p95/throughput degradation that counts as a regression")
+    bench.add_argument("--history", metavar="PATH", default="medical_terms_benchmark_history.jsonl", help="benchmark history file")
+    bench.add_argument("--label", help="label stored with this run, e.g. a git revision")
+    bench.add_argument("--baseline", metavar="LABEL", help="compare against the latest run with this label (default: the previous run)")
+    bench.set_defaults(handler=command_bench)
+    
+    models = commands.add_parser("models", parents=[target_options, account_options, quota_options],
+                                 help="compare latency, output length, error and fallback rates of every model /api/models lists")
+    models.add_argument("--models", help="comma-separated models to compare (default: all that /api/models lists)")
+    models.add_argument("--terms-file", action="append", default=[], metavar="PATH", help="term or sentence file (one per line, .gz allowed); repeatable")
+    models.add_argument("--terms", type=int, help="number of distinct terms sent to every model (default: all)")
+    models.add_argument("--concurrency", type=int, default=4, help="in-flight translations per model")
+    models.add_argument("--warmup", type=int, default=1, help="untimed translations per model before measuring")
+    models.set_defaults(handler=command_models)
+    
+    auth_stress = commands.add_parser("auth-stress", parents=[target_options, account_options],
+                                      help="ramp concurrent register, login and duplicate-username bursts against /api/auth")
+    auth_stress.add_argument("--levels", default="1,2,4,8,16", help="comma-separated concurrency levels to ramp through")
+    auth_stress.add_argument("--rounds", type=int, default=5, help="register and login calls per level, as a multiple of the level")
+    auth_stress.add_argument("--race-size", type=int, default=4, help="concurrent registrations of each duplicate username")
+    auth_stress.set_defaults(handler=command_auth_stress)
+    
+    webhooks = commands.add_parser("webhooks", parents=[target_options, account_options],
+                                   help="replay signed Stripe events at /api/stripe-webhook and check the subscriptions converge")
+    webhooks.add_argument("--secret", default=os.environ.get("STRIPE_WEBHOOK_SECRET"), help="webhook signing secret (default: $STRIPE_WEBHOOK_SECRET)")
+    webhooks.add_argument("--subscriptions", type=int, default=20, help="synthetic subscription lifecycles to generate")
+    webhooks.add_argument("--renewals", type=int, default=2, help="invoice payments per subscription")
+    webhooks.add_argument("--cancel-rate", type=float, default=0.3, help="share of subscriptions that end deleted")
+    webhooks.add_argument("--duplicate-rate", type=float, default=0.1, help="share of events redelivered later")
+    webhooks.add_argument("--reorder-rate", type=float, default=0.1, help="share of events swapped with one up to five deliveries later")
+    webhooks.add_argument("--invalid-rate", type=float, default=0.02, help="share of events also sent with a bad signature")
+    webhooks.add_argument("--rate", type=float, default=50.0, help="deliveries per second (0: as fast as concurrency allows)")
+    webhooks.add_argument("--concurrency", type=int, default=8, help="maximum in-flight deliveries")
+    webhooks.add_argument("--seed", type=int, help="random seed for a reproducible event stream")
+    webhooks.add_argument("--supabase-url", default=os.environ.get("NEXT_PUBLIC_SUPABASE_URL"),
+                          help="Supabase project to read user_subscriptions from (default: $NEXT_PUBLIC_SUPABASE_URL)")
+    webhooks.add_argument("--supabase-key", default=os.environ.get("SUPABASE_SERVICE_ROLE_KEY"),
+                          help="service role key for that read (default: $SUPABASE_SERVICE_ROLE_KEY)")
+    webhooks.set_defaults(handler=command_webhooks)
+    
+    logs = commands.add_parser("logs", help="index the JSON step events in a log file and query slow phases")
+    logs.add_argument("query", choices=["index", "runs", "phases", "slowest", "accounts"],
+                      help="index only, list runs, per-phase totals, slowest steps, or per-account time")
+    logs.add_argument("log", nargs="*", default=["medical_terms_debug.log"], help="log files to index first")
+    logs.add_argument("--index", metavar="PATH", default="medical_terms_log_index.sqlite3", help="log index database")
+    logs.add_argument("--runs", type=int, default=5, help="how many of the newest runs a query covers")
+    logs.add_argument("--limit", type=int, default=20, help="rows shown by runs and slowest")
+    logs.add_argument("--phase", help="restrict slowest to one phase")
+    logs.add_argument("--run", help="run for the accounts query (default: the newest)")
+    # Logs from this command go to stderr only, so querying a log never appends to it
+    logs.set_defaults(handler=command_logs, log_file=None)
+    
+    report = commands.add_parser("report", parents=[logging_options], help="regenerate the report from an earlier run's results file")
+    report.add_argument("results", nargs="?", help="results file (.jsonl, .jsonl.gz or .json; default: the newest medical_terms_debug_results file)")
+    report.add_argument("--base-url", help="site named in the report header")
+    report.add_argument("--trace", action="store_true", help="also rewrite the Chrome trace file from the results")
+    report.set_defaults(handler=command_report)
+    
+    monitor = commands.add_parser("monitor", parents=[target_options, account_options, quota_options, browser_options],
+                                  help="run continuously as a synthetic monitor with a metrics endpoint")
+    monitor.add_argument("--api", action="store_true", help="probe over HTTP instead of driving a browser")
+    monitor.add_argument("--interval", type=float, default=60, help="seconds between probes")
+    monitor.add_argument("--window", type=float, default=900, help="seconds of history in the rolling metrics window")
+    monitor.add_argument("--translate-every", type=int, default=1, help="include the translate step in every Nth probe")
+    monitor.add_argument("--metrics-host", default="127.0.0.1", help="metrics endpoint address")
+    monitor.add_argument("--metrics-port", type=int, default=9108, help="metrics endpoint port")
+    monitor.set_defaults(handler=command_monitor)
+    
+    history = commands.add_parser("history", parents=[target_options],
+                                  help="seed one account's history to growing sizes and measure /api/history full and paginated")
+    history.add_argument("--sizes", default="10,1000,100000", help="comma-separated history sizes to measure")
+    history.add_argument("--page-size", type=int, default=100, help="limit used when walking the paginated history")
+    history.add_argument("--workers", type=int, default=8, help="concurrent translate calls while seeding")
+    history.set_defaults(handler=command_history)
+    
+    cleanup = commands.add_parser("cleanup-accounts", parents=[logging_options, account_options],
+                                  help="retire a seed's accounts and write SQL that deletes them from the app database")
+    cleanup.add_argument("sql_path", nargs="?", default="medical_terms_account_cleanup.sql", help="where to write the cleanup SQL")
+    cleanup.set_defaults(handler=command_cleanup_accounts)
+    
+    args = parser.parse_args(argv)
+    # Checked here rather than with choices=, which argparse also applies to the empty list a bare "bench" parses to
+    if args.command == "bench":
+        unknown = [name for name in args.workloads if name not in BenchmarkSuite.WORKLOADS]
+        if unknown:
+            bench.error(f"unknown workload {', '.join(unknown)} (choose from {', '.join(BenchmarkSuite.WORKLOADS)})")
+    return args
+
+def main(argv=None):
+    """Main function to run the debugging script"""
+    args = parse_args(argv)
+    configure_logging(args.log_file or None)
+    
+    mock_server = None
+    base_url = getattr(args, "base_url", None)
+    if getattr(args, "mock", False):
+        from medical_terms_mock_server import MockConfig, MockMedicalTermsServer
+        mock_server = MockMedicalTermsServer(config=MockConfig(
+            translation_limit=args.mock_translation_limit, racy_register=getattr(args, "mock_racy_register", False)
+        )).start_in_background()
+        base_url = mock_server.url
+    
+    try:
+        args.handler(args, base_url)
+    finally:
+        if mock_server:
+            mock_server.stop()
+
+def build_account_factory(args):
+    """Open the account factory when --account-seed is given; otherwise the fixed testuserN accounts are used"""
+    if args.account_seed is None:
+        return None
+    return AccountFactory(seed=args.account_seed, index_path=args.account_index)
+
+def build_quota_scheduler(args):
+    """Create the quota scheduler, assuming --quota-limit translations for accounts not seen yet"""
+    return QuotaScheduler(default_remaining=args.quota_limit, reserve=args.quota_reserve)
+
+def build_debugger(args, base_url, corpus_partition=None, num_accounts=None):
+    """Create the debugger configured by the browser or api command's options"""
+    num_accounts = args.accounts if num_accounts is None else num_accounts
+    account_factory = build_account_factory(args)
+    if args.api:
+        debugger = MedicalTermsAPIDebugger(num_accounts=num_accounts, workers=args.workers, model=args.model,
+                                           base_url=base_url, account_factory=account_factory, trace=args.trace)
+    else:
+        debugger = MedicalTermsDebugger(
+            num_accounts=num_accounts, workers=args.workers,
+            reuse_page_structure=args.reuse_page_structure,
+            locator_cache_path=None if args.no_locator_cache else 'medical_terms_locator_cache.json',
+            recycle_sessions=args.recycle_sessions, max_driver_uses=args.max_driver_uses,
+            block_assets=args.block_assets, base_url=base_url, account_factory=account_factory, trace=args.trace
+        )
+    
+    debugger.preflight = not args.skip_preflight
+    debugger.terms_per_account = args.terms_per_account
+    if args.terms_file:
+        models = args.models.split(",") if args.api and args.models else None
+        debugger.term_corpus = TermCorpus(args.terms_file, models=models, partition=corpus_partition)
+    if args.breaker_threshold > 0:
+        debugger.circuit_breaker = CircuitBreaker(args.breaker_threshold, args.breaker_backoff, args.breaker_max_backoff)
+    if args.api:
+        debugger.quota_scheduler = build_quota_scheduler(args)
+    if args.api and args.translation_cache:
+        debugger.translation_cache = TranslationCache(args.translation_cache)
+        debugger.refresh_translations = args.refresh_translations
+    return debugger
+
+def drain_work_queue(args, base_url, queue_dir):
+    """Worker process entry point: run claimed chunks until the queue is empty"""
+    # Spawned processes start with a fresh interpreter, so logging is configured again here
+    configure_logging(args.log_file or None)
+    work_queue = WorkQueue(queue_dir)
+    chunk_count = work_queue.chunk_count
+    while True:
+        chunk = work_queue.claim()
+        if chunk is None:
+            return
+        logger.info(f"Worker {os.getpid()} running chunk {chunk['chunk_id']} ({len(chunk['accounts'])} accounts)")
+        # Each chunk covers its own slice of the corpus, so shards never translate the same text twice
+        debugger = build_debugger(args, base_url, corpus_partition=(chunk["chunk_id"], chunk_count), num_accounts=0)
+        debugger.test_accounts = chunk["accounts"]
+        debugger.results_writer = ResultsWriter(work_queue.result_path(chunk["chunk_id"]), resume=True)
+        try:
+            debugger.run_debug_tests()
+        finally:
+            debugger.results_writer.close()
+        work_queue.complete(chunk["chunk_id"])
+
+def run_sharded(args, base_url):
+    """Enqueue, drain with worker processes and/or merge, according to --queue-role"""
+    import multiprocessing
+    import tempfile
+    queue_dir = args.queue_dir or tempfile.mkdtemp(prefix="medical_terms_queue_")
+    work_queue = WorkQueue(queue_dir)
+    # Accounts are only generated when enqueueing; work and merge roles would otherwise issue unused seeded accounts
+    debugger = build_debugger(args, base_url, num_accounts=0)
+    
+    if args.queue_role in ("all", "enqueue"):
+        accounts = debugger.generate_test_accounts(args.accounts)
+        chunk_size = args.chunk_size or max(1, math.ceil(len(accounts) / (max(1, args.shards) * 4)))
+        work_queue.enqueue(accounts, chunk_size)
+    
+    if args.queue_role in ("all", "work"):
+        if args.requeue_claimed:
+            logger.info(f"Requeued {work_queue.requeue_claimed()} claimed chunks")
+        # spawn avoids forking a process that may already hold WebDriver threads and sockets
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=drain_work_queue, args=(args, base_url, queue_dir), name=f"shard-{i}")
+            for i in range(max(1, args.shards))
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        failed = [process.name for process in processes if process.exitcode != 0]
+        if failed:
+            logger.error(f"Shard processes failed: {', '.join(failed)}")
+    
+    if args.queue_role in ("all", "merge"):
+        unfinished = work_queue.unfinished()
+        if unfinished:
+            logger.warning(f"{unfinished} chunks are not finished; the report covers completed accounts only")
+        debugger.results_writer = work_queue.merge(args.stream_results or 'medical_terms_debug_results.jsonl')
+        debugger.generate_report()
+
+def command_run(args, base_url):
+    """browser and api commands: run the register -> login -> translate scenario for every account"""
+    if args.shards or args.queue_dir:
+        run_sharded(args, base_url)
+        return
+    
+    debugger = build_debugger(args, base_url)
+    if args.stream_results:
+        debugger.results_writer = ResultsWriter(args.stream_results, resume=args.resume)
+    
+    try:
+        debugger.run_debug_tests()
+        debugger.generate_report()
+        if debugger.account_factory:
+            logger.info(f"Account index {debugger.account_factory.index_path}: {debugger.account_factory.state_counts()}")
+        if debugger.term_corpus:
+            logger.info(f"Term corpus: {debugger.term_corpus.planned} text/model pairs planned, {debugger.term_corpus.duplicates} duplicate texts skipped")
+        if args.api and args.translation_cache and args.golden:
+            debugger.compare_translations_to_golden(args.golden)
+        logger.info("Debug tests completed successfully")
+    except Exception as e:
+        logger.error(f"Debug tests failed: {e}")
+        raise
+
+def command_load(args, base_url):
+    """load command: spread Poisson translate arrivals across logged-in accounts"""
+    account_factory = build_account_factory(args)
+    if account_factory and args.warm_accounts:
+        warm = account_factory.warm(args.accounts, quota_limit=args.quota_limit)
+        logger.info(f"Reusing {len(warm)} warm accounts; {args.accounts - len(warm)} fresh accounts will be registered")
+        debugger = MedicalTermsDebugger(num_accounts=args.accounts - len(warm), base_url=base_url, account_factory=account_factory)
+        debugger.test_accounts = warm + debugger.test_accounts
+    else:
+        debugger = MedicalTermsDebugger(num_accounts=args.accounts, base_url=base_url, account_factory=account_factory)
+    load_generator = TranslateLoadGenerator(
+        debugger, concurrency=args.concurrency, arrival_rate=args.rate,
+        duration=args.duration, model=args.model, quota_scheduler=build_quota_scheduler(args)
+    )
+    load_generator.run()
+
+def command_bench(args, base_url):
+    """bench command: run workloads, compare against the baseline and exit 1 on regression"""
+    debugger = MedicalTermsAPIDebugger(num_accounts=0, model=args.model, base_url=base_url)
+    suite = BenchmarkSuite(
+        debugger, history_path=args.history, warmup=args.warmup,
+        iterations=args.iterations, repetitions=args.repetitions,
+        threshold=args.threshold, label=args.label,
+        account_factory=build_account_factory(args), target="mock" if args.mock else None
+    )
+    if suite.run(args.workloads, baseline=args.baseline):
+        raise SystemExit(1)
+
+def command_models(args, base_url):
+    """models command: run the same terms against every model and write the comparison"""
+    debugger = MedicalTermsAPIDebugger(num_accounts=0, base_url=base_url)
+    terms = None
+    if args.terms_file:
+        # dict.fromkeys drops repeated texts but keeps file order, so every model sees the same sequence
+        terms = list(dict.fromkeys(TermCorpus(args.terms_file).iter_texts()))
+    if args.terms:
+        terms = (terms or debugger.medical_terms)[:args.terms]
+    benchmark = ModelBenchmark(
+        debugger, models=args.models.split(",") if args.models else None, terms=terms,
+        concurrency=args.concurrency, warmup=args.warmup,
+        quota_scheduler=build_quota_scheduler(args), account_factory=build_account_factory(args)
+    )
+    benchmark.run()
+
+def command_auth_stress(args, base_url):
+    """auth-stress command: ramp /api/auth concurrency; exit 1 if a username was registered twice"""
+    debugger = MedicalTermsAPIDebugger(num_accounts=0, base_url=base_url)
+    stress = AuthStress(debugger, levels=[int(level) for level in args.levels.split(",")], rounds=args.rounds,
+                        race_size=max(2, args.race_size), account_factory=build_account_factory(args))
+    if any(result["duplicate"]["double_registrations"] for result in stress.run()):
+        raise SystemExit(1)
+
+def command_webhooks(args, base_url):
+    """webhooks command: replay Stripe events; exit 1 if deliveries fail or subscriptions do not converge"""
+    secret, state_url = args.secret, args.supabase_url
+    if args.mock:
+        # The mock checks its own test secret and serves its subscription rows in Supabase's REST shape
+        from medical_terms_mock_server import MOCK_WEBHOOK_SECRET
+        secret, state_url = MOCK_WEBHOOK_SECRET, base_url
+    if not secret:
+        raise SystemExit("webhooks needs --secret or $STRIPE_WEBHOOK_SECRET")
+    debugger = MedicalTermsAPIDebugger(num_accounts=0, base_url=base_url)
+    replay = WebhookReplay(
+        debugger, secret, subscriptions=args.subscriptions, renewals=args.renewals, cancel_rate=args.cancel_rate,
+        duplicate_rate=args.duplicate_rate, reorder_rate=args.reorder_rate, invalid_rate=args.invalid_rate,
+        rate=args.rate, concurrency=max(1, args.concurrency), state_url=state_url, state_key=args.supabase_key,
+        account_factory=build_account_factory(args), seed=args.seed
+    )
+    result = replay.run()
+    if result["unexpected_statuses"] or (result["convergence"] and result["convergence"]["diverged"]):
+        raise SystemExit(1)
+
+def command_logs(args, base_url):
+    """logs command: bring the index up to date, then print the requested query"""
+    index = LogIndex(args.index)
+    try:
+        started = time.perf_counter()
+        added = sum(index.update(path) for path in args.log)
+        logger.info(f"Indexed {added} new step events in {time.perf_counter() - started:.2f}s")
+        
+        if args.query == "runs":
+            print(f"{'RUN':<28} {'STARTED':<28} {'ENDED':<28} {'EVENTS':>8}")
+            for run, started_at, ended_at, events in index.recent_runs(args.limit):
+                print(f"{run:<28} {started_at:<28} {ended_at:<28} {events:>8}")
+        elif args.query == "phases":
+            print(f"{'PHASE':<28} {'COUNT':>7} {'TOTAL':>10} {'MEAN':>9} {'MAX':>9} {'NOT OK':>7}")
+            for phase, count, total, mean, longest, failed in index.phase_summary(args.runs):
+                print(f"{phase:<28} {count:>7} {total:>9.2f}s {mean:>8.3f}s {longest:>8.3f}s {failed:>7}")
+        elif args.query == "slowest":
+            print(f"{'DURATION':>9}  {'PHASE':<24} {'OUTCOME':<8} {'ACCOUNT':<24} {'RUN':<28} TIME")
+            for run, ts, account, phase, duration, outcome in index.slowest_events(args.runs, args.limit, args.phase):
+                print(f"{duration:>8.3f}s  {phase:<24} {outcome:<8} {str(account):<24} {run:<28} {ts}")
+        elif args.query == "accounts":
+            run, breakdown = index.account_breakdown(args.run)
+            phases = sorted({phase for timings in breakdown.values() for phase in timings})
+            print(f"Run {run}")
+            print(f"{'ACCOUNT':<24} {'TOTAL':>9} " + " ".join(f"{phase[:14]:>14}" for phase in phases))
+            for account, timings in sorted(breakdown.items(), key=lambda item: -sum(item[1].values())):
+                print(f"{str(account):<24} {sum(timings.values()):>8.2f}s " + " ".join(
+                    f"{timings[phase]:>13.3f}s" if phase in timings else f"{'-':>14}" for phase in phases))
+    finally:
+        index.close()
+
+def latest_results_path():
+    """Newest results file a streamed or non-streamed run left in the working directory"""
+    candidates = [path for path in ('medical_terms_debug_results.jsonl', 'medical_terms_debug_results.jsonl.gz', 'medical_terms_debug_results.json')
+                  if os.path.exists(path)]
+    return max(candidates, key=os.path.getmtime, default='medical_terms_debug_results.jsonl')
+
+def command_report(args, base_url):
+    """report command: rebuild the summary, latency and optional trace files from a results file"""
+    debugger = MedicalTermsDebugger(num_accounts=0, locator_cache_path=None, base_url=base_url, trace=args.trace)
+    results_path = args.results or latest_results_path()
+    if not os.path.exists(results_path):
+        raise SystemExit(f"report: results file {results_path} not found")
+    debugger.results_writer = ResultsReader(results_path)
+    debugger.generate_report()
+
+def command_monitor(args, base_url):
+    """monitor command: probe on a schedule until interrupted, serving rolling metrics"""
+    if args.api:
+        debugger = MedicalTermsAPIDebugger(num_accounts=0, base_url=base_url)
+    else:
+        debugger = MedicalTermsDebugger(num_accounts=0, locator_cache_path=None if args.no_locator_cache else 'medical_terms_locator_cache.json',
+                                        block_assets=args.block_assets, base_url=base_url)
+    monitor = SyntheticMonitor(
+        debugger, interval=args.interval, window=args.window,
+        translate_every=args.translate_every, quota_limit=args.quota_limit,
+        account_factory=build_account_factory(args), max_driver_uses=args.max_driver_uses or 500
+    )
+    server = monitor.serve_metrics(args.metrics_host, args.metrics_port)
+    try:
+        monitor.run()
+    except KeyboardInterrupt:
+        logger.info("Monitor stopped")
+    finally:
+        server.shutdown()
+
+def command_history(args, base_url):
+    """history command: measure /api/history as one account's history grows; exit 1 if pagination misbehaves"""
+    debugger = MedicalTermsAPIDebugger(num_accounts=0, base_url=base_url)
+    probe = HistoryScalingProbe(debugger, sizes=[int(size) for size in args.sizes.split(",")],
+                                page_size=args.page_size, seed_workers=max(1, args.workers))
+    if not all(result["paginated"]["verified"] for result in probe.run()):
+        raise SystemExit(1)
+
+def command_cleanup_accounts(args, base_url):
+    """cleanup-accounts command: retire a seed's accounts and write the SQL that deletes them"""
+    account_factory = build_account_factory(args)
+    if not account_factory:
+        raise SystemExit("cleanup-accounts needs --account-seed")
+    account_factory.cleanup(args.sql_path)
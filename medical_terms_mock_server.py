@@ -0,0 +1,603 @@
+#!/usr/bin/env python3
+"""
+Medical Terms Local Mock Server
+Stand-in for the Next.js app's pages and API routes so the debugging harness can run offline
+"""
+
+import re
+import json
+import time
+import hmac
+import hashlib
+import random
+import logging
+import base64
+import bisect
+import argparse
+import threading
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger(__name__)
+
+AVAILABLE_MODELS = ["llama3-70b-8192", "llama3-8b-8192", "mixtral-8x7b-32768", "gemma-7b-it"]
+DEFAULT_MODEL = "llama3-70b-8192"
+MAX_HISTORY_PAGE_SIZE = 100
+FALLBACK_MODEL = "llama3-8b-8192"
+# Local test secret for /api/stripe-webhook; stripe.webhooks.constructEvent's default tolerance is 300 seconds
+MOCK_WEBHOOK_SECRET = "whsec_medical_terms_mock"
+WEBHOOK_TOLERANCE = 300
+# Pause between the duplicate check and the insert in racy register mode, wide enough for concurrent sign-ups to overlap
+REGISTER_RACE_WINDOW = 0.005
+# Same pattern decodeHistoryCursor accepts before a cursor's timestamp reaches a PostgREST filter
+HISTORY_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{1,6})?(Z|[+-]\d{2}:\d{2})?")
+
+# Mirrors the markup of app/page.tsx with AuthForm and TranslationForm closely enough for the browser flow
+HOME_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Medical Terms Translator</title>
+</head>
+<body>
+<nav><a href="/">Medical Terms</a> <a href="/dashboard">Dashboard</a> <a href="/subscription">Subscription</a></nav>
+<main class="container mx-auto px-4 py-12">
+  <h1 class="text-4xl font-light tracking-tight text-center mb-2">Medical Terms <span>Translator</span></h1>
+  <div id="auth" class="max-w-3xl mx-auto">
+    <h2 id="auth-title">Sign In</h2>
+    <form id="auth-form" class="space-y-4">
+      <div><input type="text" placeholder="Username" required minlength="3" maxlength="20"></div>
+      <div><input type="password" placeholder="Password" required minlength="6"></div>
+      <p id="auth-error" class="text-red-500 text-sm"></p>
+      <button type="submit" id="auth-submit">Sign In</button>
+      <p class="text-center text-sm"><span id="auth-prompt">Don't have an account?</span>
+        <button type="button" id="auth-toggle">Sign Up</button></p>
+    </form>
+  </div>
+  <div id="translate" class="space-y-8" style="display: none">
+    <form id="translate-form" class="space-y-4">
+      <textarea placeholder="Enter medical text here..." class="w-full p-4 min-h-[150px]"></textarea>
+      <select id="model"></select>
+      <button type="submit">Translate</button>
+    </form>
+    <p id="translate-error" class="text-red-500 text-sm"></p>
+    <div id="translate-result" style="display: none">
+      <h3 class="text-xl font-medium mb-3">Simplified Explanation</h3>
+      <p class="whitespace-pre-line"></p>
+    </div>
+  </div>
+</main>
+<script>
+var isLogin = true;
+var user = JSON.parse(localStorage.getItem("user") || "null");
+function show() {
+  document.getElementById("auth").style.display = user ? "none" : "";
+  document.getElementById("translate").style.display = user ? "" : "none";
+}
+document.getElementById("auth-toggle").onclick = function() {
+  isLogin = !isLogin;
+  document.getElementById("auth-title").textContent = isLogin ? "Sign In" : "Create Account";
+  document.getElementById("auth-submit").textContent = isLogin ? "Sign In" : "Create Account";
+  document.getElementById("auth-prompt").textContent = isLogin ? "Don't have an account?" : "Already have an account?";
+  this.textContent = isLogin ? "Sign Up" : "Sign In";
+};
+document.getElementById("auth-form").onsubmit = function(e) {
+  e.preventDefault();
+  var inputs = this.getElementsByTagName("input");
+  fetch("/api/auth", {method: "POST", headers: {"Content-Type": "application/json"},
+    body: JSON.stringify({action: isLogin ? "login" : "register", username: inputs[0].value, password: inputs[1].value})})
+    .then(function(r) { return r.json().then(function(d) { if (!r.ok) throw new Error(d.error); return d; }); })
+    .then(function(d) { user = {id: d.data.userId, username: d.data.username}; localStorage.setItem("user", JSON.stringify(user)); show(); })
+    .catch(function(err) { document.getElementById("auth-error").textContent = err.message; });
+};
+fetch("/api/models").then(function(r) { return r.json(); }).then(function(d) {
+  var select = document.getElementById("model");
+  d.data.forEach(function(m) { var o = document.createElement("option"); o.value = o.textContent = m; select.appendChild(o); });
+});
+document.getElementById("translate-form").onsubmit = function(e) {
+  e.preventDefault();
+  var text = this.getElementsByTagName("textarea")[0].value;
+  fetch("/api/translate", {method: "POST", headers: {"Content-Type": "application/json"},
+    body: JSON.stringify({userId: user.id, medicalText: text, model: document.getElementById("model").value})})
+    .then(function(r) { return r.json().then(function(d) { if (!r.ok) throw new Error(d.error); return d; }); })
+    .then(function(d) {
+      var result = document.getElementById("translate-result");
+      result.getElementsByTagName("p")[0].textContent = d.data.explanation;
+      result.style.display = "";
+    })
+    .catch(function(err) { document.getElementById("translate-error").textContent = err.message; });
+};
+show();
+</script>
+</body>
+</html>
+"""
+
+SIMPLE_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body><nav><a href="/">Medical Terms</a></nav><main><h1>{title}</h1></main></body>
+</html>
+"""
+
+class MockBackendError(Exception):
+    """Injected failure of a simulated database or AI step"""
+
+class MockConfig:
+    """Latency and error injection settings for the simulated database and AI steps"""
+
+    def __init__(self, db_latency=0.0, ai_latency=0.0, latency_jitter=0.0,
+                 db_error_rate=0.0, ai_error_rate=0.0, translation_limit=5, seed=None,
+                 webhook_secret=MOCK_WEBHOOK_SECRET, racy_register=False):
+        self.db_latency = db_latency
+        self.ai_latency = ai_latency
+        self.latency_jitter = latency_jitter
+        self.db_error_rate = db_error_rate
+        self.ai_error_rate = ai_error_rate
+        # Free tier allows 5 translations, as in checkTranslationLimit; -1 means unlimited
+        self.translation_limit = translation_limit
+        self.seed = seed
+        self.webhook_secret = webhook_secret
+        # registerUser checks for the username and inserts in separate queries; racy mode reproduces that gap
+        self.racy_register = racy_register
+
+class MockAppState:
+    """In-memory users, usage counters and translation history behind the mock routes"""
+
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.rng = random.Random(config.seed)
+        self.users = {}
+        self.users_by_id = {}
+        self.usage = {}
+        self.history = {}
+        # Per-user (submittedAt, submissionId) keys kept sorted alongside history for keyset pagination
+        self.history_keys = {}
+        self.next_user_id = 1
+        self.next_submission_id = 1
+        # user_subscriptions rows keyed by user_id, the upsert key of handleCheckoutCompleted
+        self.subscriptions = {}
+
+    def step(self, kind):
+        """Simulate one database or AI call: sleep for its latency, then fail at its error rate"""
+        latency = self.config.ai_latency if kind == "ai" else self.config.db_latency
+        error_rate = self.config.ai_error_rate if kind == "ai" else self.config.db_error_rate
+        with self.lock:
+            jitter = self.rng.uniform(0, self.config.latency_jitter) if self.config.latency_jitter else 0.0
+            failed = error_rate > 0 and self.rng.random() < error_rate
+        if latency or jitter:
+            time.sleep(latency + jitter)
+        if failed:
+            raise MockBackendError(f"Injected {kind} failure")
+
+    def register(self, username, password):
+        """Mirror registerUser: duplicate check, then insert"""
+        self.step("db")
+        with self.lock:
+            if username in self.users:
+                raise ValueError("Username already exists")
+        if self.config.racy_register:
+            time.sleep(REGISTER_RACE_WINDOW)
+        self.step("db")
+        with self.lock:
+            if username in self.users and not self.config.racy_register:
+                # A concurrent registration won the race between the duplicate check and the insert
+                raise ValueError("Username already exists")
+            user = {"id": self.next_user_id, "username": username, "password": password}
+            self.next_user_id += 1
+            self.users[username] = user
+            self.users_by_id[user["id"]] = user
+            self.usage[user["id"]] = 0
+            self.history[user["id"]] = []
+            self.history_keys[user["id"]] = []
+        return user
+
+    def login(self, username, password):
+        """Mirror loginUser: look up the user and compare the password"""
+        self.step("db")
+        with self.lock:
+            user = self.users.get(username)
+        if not user or user["password"] != password:
+            raise ValueError("Invalid username or password")
+        return user
+
+    def check_limit(self, user_id):
+        """Mirror checkTranslationLimit"""
+        self.step("db")
+        limit = self.config.translation_limit
+        if limit < 0:
+            return True, -1, -1
+        with self.lock:
+            used = self.usage.get(user_id, 0)
+        return used < limit, max(0, limit - used), limit
+
+    def translate_text(self, text, model):
+        """Simulate translateMedicalText with a deterministic explanation"""
+        self.step("ai")
+        return f"In plain language, \"{text}\" describes a medical condition explained simply ({model})."
+
+    def save_translation(self, user_id, text, explanation):
+        """Mirror submitMedicalText, saveLaymenTerms and incrementTranslationUsage"""
+        self.step("db")
+        with self.lock:
+            submission_id = self.next_submission_id
+            self.next_submission_id += 1
+        self.step("db")
+        now = datetime.now().isoformat()
+        entry = {
+            "userId": user_id,
+            "username": self.users_by_id.get(user_id, {}).get("username"),
+            "submissionId": submission_id,
+            "submittedText": text,
+            "submittedAt": now,
+            "laymenTermId": submission_id,
+            "explanation": explanation,
+            "returnedAt": now
+        }
+        self.step("db")
+        with self.lock:
+            keys = self.history_keys.setdefault(user_id, [])
+            key = (entry["submittedAt"], submission_id)
+            position = bisect.bisect(keys, key)
+            keys.insert(position, key)
+            self.history.setdefault(user_id, []).insert(position, entry)
+            self.usage[user_id] = self.usage.get(user_id, 0) + 1
+        return submission_id
+
+    def user_history(self, user_id):
+        """Mirror getUserTranslations: newest first"""
+        self.step("db")
+        with self.lock:
+            return list(reversed(self.history.get(user_id, [])))
+
+    def user_history_page(self, user_id, limit, cursor=None):
+        """Mirror getUserTranslationsPage: up to limit entries older than the cursor key, newest first"""
+        self.step("db")
+        limit = min(max(limit, 1), MAX_HISTORY_PAGE_SIZE)
+        with self.lock:
+            keys = self.history_keys.get(user_id, [])
+            end = bisect.bisect_left(keys, tuple(cursor)) if cursor else len(keys)
+            items = list(reversed(self.history.get(user_id, [])[max(0, end - limit):end]))
+            has_more = end > limit
+        next_cursor = encode_history_cursor(items[-1]) if has_more and items else None
+        return items, next_cursor
+
+    def apply_webhook_event(self, event):
+        """Mirror the stripe-webhook route's handlers, including their swallowed database errors"""
+        obj = event.get("data", {}).get("object", {})
+        event_type = event.get("type")
+        now = datetime.now().isoformat()
+        try:
+            if event_type == "checkout.session.completed":
+                metadata = obj.get("metadata") or {}
+                if not metadata.get("userId") or not metadata.get("planId"):
+                    return
+                self.step("db")
+                with self.lock:
+                    self.subscriptions[int(metadata["userId"])] = {
+                        "user_id": int(metadata["userId"]),
+                        "plan_id": str(metadata["planId"]),
+                        "stripe_customer_id": obj.get("customer"),
+                        "stripe_subscription_id": obj.get("subscription"),
+                        "status": "active",
+                        "is_active": True,
+                        "translations_used": 0,
+                        "end_date": None,
+                        "updated_at": now
+                    }
+            elif event_type in ("customer.subscription.created", "customer.subscription.updated"):
+                self.step("db")
+                self.update_subscriptions("stripe_subscription_id", obj.get("id"), is_active=obj.get("status") == "active", updated_at=now)
+            elif event_type == "customer.subscription.deleted":
+                self.step("db")
+                self.update_subscriptions("stripe_subscription_id", obj.get("id"), is_active=False, end_date=now)
+            elif event_type == "invoice.payment_succeeded":
+                self.step("db")
+                self.update_subscriptions("stripe_customer_id", obj.get("customer"), active_only=True, translations_used=0, updated_at=now)
+        except MockBackendError as e:
+            # The route's handlers log and return, so the event is acknowledged without being written
+            logger.debug(f"Webhook {event.get('id')} lost: {e}")
+
+    def update_subscriptions(self, column, value, active_only=False, **values):
+        """Mirror supabase .update(values).eq(column, value), optionally .eq('is_active', true)"""
+        with self.lock:
+            for row in self.subscriptions.values():
+                if row[column] == value and (row["is_active"] or not active_only):
+                    row.update(values)
+
+    def subscription_rows(self, column=None, values=None):
+        """Return user_subscriptions rows, optionally those whose column is in values"""
+        with self.lock:
+            return [dict(row) for row in self.subscriptions.values() if column is None or str(row.get(column)) in values]
+
+def verify_stripe_signature(payload, header, secret, tolerance=WEBHOOK_TOLERANCE):
+    """Mirror stripe.webhooks.constructEvent: an HMAC-SHA256 v1 signature of 't.payload' within the tolerance"""
+    parts = [part.split("=", 1) for part in (header or "").split(",") if "=" in part]
+    timestamps = [value for key, value in parts if key == "t"]
+    signatures = [value for key, value in parts if key == "v1"]
+    if not timestamps or not signatures or not timestamps[0].isdigit():
+        return False
+    expected = hmac.new(secret.encode("utf-8"), timestamps[0].encode("ascii") + b"." + payload, hashlib.sha256).hexdigest()
+    if not any(hmac.compare_digest(expected, signature) for signature in signatures):
+        return False
+    return abs(time.time() - int(timestamps[0])) <= tolerance
+
+def encode_history_cursor(entry):
+    """Mirror encodeHistoryCursor: base64url JSON of the row's (submittedAt, submissionId)"""
+    raw = json.dumps([entry["submittedAt"], entry["submissionId"]], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+def decode_history_cursor(cursor):
+    """Mirror decodeHistoryCursor, returning None for a malformed cursor"""
+    try:
+        submitted_at, submission_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(submitted_at, str) or not isinstance(submission_id, int):
+        return None
+    if not HISTORY_TIMESTAMP.fullmatch(submitted_at):
+        return None
+    try:
+        datetime.fromisoformat(submitted_at.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return submitted_at, submission_id
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the mock pages and API handlers"""
+
+    # HTTP/1.1 keeps connections alive so pooled clients behave as they do against the real site
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without TCP_NODELAY each keep-alive response stalls on delayed ACK
+    disable_nagle_algorithm = True
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def send_body(self, status, body, content_type):
+        """Send a complete response with a Content-Length header"""
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_json(self, status, payload):
+        self.send_body(status, json.dumps(payload), "application/json")
+
+    def read_json(self):
+        """Read and decode the JSON request body, or return None if it is not valid JSON"""
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return None
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path == "/":
+            self.send_body(200, HOME_PAGE, "text/html; charset=utf-8")
+        elif parsed.path in ("/dashboard", "/subscription"):
+            self.send_body(200, SIMPLE_PAGE.format(title=parsed.path.strip("/").title()), "text/html; charset=utf-8")
+        elif parsed.path == "/api/models":
+            self.send_json(200, {"success": True, "data": AVAILABLE_MODELS})
+        elif parsed.path == "/api/history":
+            self.handle_history(parse_qs(parsed.query))
+        elif parsed.path == "/rest/v1/user_subscriptions":
+            self.handle_subscription_rows(parse_qs(parsed.query))
+        else:
+            self.send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        if path == "/api/auth":
+            self.handle_auth()
+        elif path == "/api/translate":
+            self.handle_translate()
+        elif path == "/api/stripe-webhook":
+            self.handle_stripe_webhook()
+        else:
+            self.send_json(404, {"error": "Not found"})
+
+    def handle_auth(self):
+        """Mirror app/api/auth/route.ts"""
+        body = self.read_json()
+        if body is None:
+            self.send_json(500, {"error": "Authentication failed"})
+            return
+        action, username, password = body.get("action"), body.get("username"), body.get("password")
+        if not username or not password:
+            self.send_json(400, {"error": "Username and password are required"})
+            return
+
+        if action == "login":
+            try:
+                user = self.state.login(username, password)
+            except (ValueError, MockBackendError) as e:
+                self.send_json(401, {"error": str(e)})
+                return
+        elif action == "register":
+            try:
+                user = self.state.register(username, password)
+            except (ValueError, MockBackendError) as e:
+                self.send_json(400, {"error": str(e)})
+                return
+        else:
+            self.send_json(400, {"error": "Invalid action"})
+            return
+        self.send_json(200, {"data": {"userId": user["id"], "username": user["username"]}})
+
+    def handle_translate(self):
+        """Mirror app/api/translate/route.ts, including its partial fallback response"""
+        body = self.read_json()
+        if body is None:
+            self.send_json(500, {"error": "Failed to process translation", "details": "Invalid JSON"})
+            return
+        user_id, text = body.get("userId"), body.get("medicalText")
+        if not user_id or not text:
+            self.send_json(400, {"error": "User ID and medical text are required"})
+            return
+
+        try:
+            can_translate, _, _ = self.state.check_limit(user_id)
+            if not can_translate:
+                self.send_json(403, {"error": "Translation limit reached", "subscription": {"remaining": 0}})
+                return
+            explanation = self.state.translate_text(text, body.get("model") or DEFAULT_MODEL)
+            submission_id = self.state.save_translation(user_id, text, explanation)
+            _, remaining, limit = self.state.check_limit(user_id)
+        except MockBackendError:
+            try:
+                explanation = self.state.translate_text(text, FALLBACK_MODEL)
+            except MockBackendError:
+                explanation = f"We couldn't process your request fully, but here's the original text: \"{text}\""
+            self.send_json(200, {"success": True, "data": {
+                "submissionId": -1,
+                "laymenTermId": -1,
+                "explanation": explanation,
+                "subscription": {"remaining": 5, "limit": 5},
+                "partial": True
+            }})
+            return
+
+        self.send_json(200, {"success": True, "data": {
+            "submissionId": submission_id,
+            "laymenTermId": submission_id,
+            "explanation": explanation,
+            "subscription": {"remaining": remaining, "limit": limit}
+        }})
+
+    def handle_stripe_webhook(self):
+        """Mirror app/api/stripe-webhook/route.ts"""
+        payload = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        signature = self.headers.get("Stripe-Signature")
+        if not signature:
+            self.send_json(400, {"error": "No signature"})
+            return
+        if not verify_stripe_signature(payload, signature, self.state.config.webhook_secret):
+            self.send_json(400, {"error": "Invalid signature"})
+            return
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            self.send_json(400, {"error": "Invalid signature"})
+            return
+        self.state.apply_webhook_event(event)
+        self.send_json(200, {"received": True})
+
+    def handle_subscription_rows(self, query):
+        """Serve user_subscriptions the way Supabase's REST API does, supporting column=in.(a,b) filters"""
+        column, values = None, None
+        for key, (value, *_) in query.items():
+            if key != "select" and value.startswith("in.(") and value.endswith(")"):
+                column, values = key, set(value[4:-1].split(","))
+        self.send_json(200, self.state.subscription_rows(column, values))
+
+    def handle_history(self, query):
+        """Mirror app/api/history/route.ts"""
+        user_id = query.get("userId", [None])[0]
+        if not user_id:
+            self.send_json(400, {"error": "User ID is required"})
+            return
+        limit = query.get("limit", [None])[0]
+        if limit is not None:
+            self.handle_history_page(user_id, limit, query.get("cursor", [None])[0])
+            return
+        try:
+            translations = self.state.user_history(int(user_id))
+        except (ValueError, MockBackendError):
+            self.send_json(500, {"error": "Failed to fetch translation history"})
+            return
+        self.send_json(200, {"success": True, "data": translations})
+
+    def handle_history_page(self, user_id, limit, cursor_param):
+        """Mirror the ?limit=&cursor= branch of app/api/history/route.ts"""
+        # parseInt would accept "10abc"; the route only takes plain digits
+        page_size = int(limit) if limit.isascii() and limit.isdigit() else 0
+        if page_size < 1:
+            self.send_json(400, {"error": "limit must be a positive integer"})
+            return
+        cursor = decode_history_cursor(cursor_param) if cursor_param else None
+        if cursor_param and not cursor:
+            self.send_json(400, {"error": "Invalid cursor"})
+            return
+        try:
+            items, next_cursor = self.state.user_history_page(int(user_id), page_size, cursor)
+        except (ValueError, MockBackendError):
+            self.send_json(500, {"error": "Failed to fetch translation history"})
+            return
+        self.send_json(200, {"success": True, "data": items, "nextCursor": next_cursor})
+
+class MockMedicalTermsServer(ThreadingHTTPServer):
+    """Threaded HTTP server serving the mock app; port 0 picks a free port"""
+
+    daemon_threads = True
+    # Concurrent bursts from the stress modes would otherwise overflow the default backlog of 5 and stall on SYN retries
+    request_queue_size = 128
+
+    def __init__(self, host="127.0.0.1", port=0, config=None):
+        super().__init__((host, port), MockRequestHandler)
+        self.state = MockAppState(config or MockConfig())
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start_in_background(self):
+        """Serve from a daemon thread and return self"""
+        self.thread = threading.Thread(target=self.serve_forever, name="mock-server", daemon=True)
+        self.thread.start()
+        logger.info(f"Mock server listening on {self.url}")
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        self.shutdown()
+        self.server_close()
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Local stand-in for the Medical Terms app")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--db-latency", type=float, default=0.0, help="seconds added to each simulated database call")
+    parser.add_argument("--ai-latency", type=float, default=0.0, help="seconds added to each simulated AI call")
+    parser.add_argument("--latency-jitter", type=float, default=0.0, help="extra uniform random latency up to this many seconds")
+    parser.add_argument("--db-error-rate", type=float, default=0.0, help="probability that a database call fails")
+    parser.add_argument("--ai-error-rate", type=float, default=0.0, help="probability that an AI call fails")
+    parser.add_argument("--translation-limit", type=int, default=5, help="translations per user (-1 for unlimited)")
+    parser.add_argument("--seed", type=int, help="random seed for reproducible latency and errors")
+    parser.add_argument("--webhook-secret", default=MOCK_WEBHOOK_SECRET, help="secret that /api/stripe-webhook signatures are checked against")
+    parser.add_argument("--racy-register", action="store_true", help="don't re-check the username at insert time, so concurrent sign-ups can both succeed as in the app")
+    return parser.parse_args(argv)
+
+def main():
+    """Run the mock server in the foreground"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = parse_args()
+    config = MockConfig(
+        db_latency=args.db_latency, ai_latency=args.ai_latency, latency_jitter=args.latency_jitter,
+        db_error_rate=args.db_error_rate, ai_error_rate=args.ai_error_rate,
+        translation_limit=args.translation_limit, seed=args.seed, webhook_secret=args.webhook_secret,
+        racy_register=args.racy_register
+    )
+    server = MockMedicalTermsServer(args.host, args.port, config)
+    logger.info(f"Mock server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()